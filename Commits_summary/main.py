@@ -1,10 +1,11 @@
 # main.py
+# Run from the repository root: python -m Commits_summary.main
 
 import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from commits_api import get_projects, get_commits_for_project
-from utils import summarize_commit
+from apis.commits_api import get_projects, get_commits_for_project
+from utils.commit_classifier import CATEGORY_LABELS, author_category_counts, summarize_batch
 
 load_dotenv()
 
@@ -20,12 +21,14 @@ def get_user_input():
 
 def generate_summary(projects, token, days):
     since_date = datetime.now().astimezone() - timedelta(days=days)
+    headers = {"PRIVATE-TOKEN": token}
 
     print("\n🔍 GitLab Contribution Summary:\n")
     for project in projects:
         project_name = project['name_with_namespace']
         project_id = project['id']
-        commits = get_commits_for_project(project_id, token, since_date)
+        # Finished days come from the per-day cache; only today is requested
+        commits = get_commits_for_project(project_id, since_date, headers)
 
         print(f"\n📁 {project_name}")
         if not commits:
@@ -33,22 +36,25 @@ def generate_summary(projects, token, days):
             continue
 
         author_commits = {}
-        for commit in commits:
+        for commit, summary in zip(commits, summarize_batch([commit['title'] for commit in commits])):
             author = commit['author_name']
-            author_commits.setdefault(author, []).append(commit)
+            author_commits.setdefault(author, []).append((commit, summary))
+        category_counts = author_category_counts(commits)
 
         for author, commit_list in author_commits.items():
-            print(f"  👤 {author}: {len(commit_list)} commit(s)")
-            for commit in commit_list:
-                msg = commit['title']
+            breakdown = ", ".join(
+                f"{CATEGORY_LABELS.get(category, '📝 Other')} ×{count}"
+                for category, count in category_counts[author].most_common()
+            )
+            print(f"  👤 {author}: {len(commit_list)} commit(s) ({breakdown})")
+            for commit, summary in commit_list:
                 date = commit['created_at']
-                summary = summarize_commit(msg)
                 print(f"     - [{date[:10]}] {summary}")
 
 
 def main():
     group_id_or_path, days = get_user_input()
-    projects = get_projects(group_id_or_path, token)
+    projects = get_projects(group_id_or_path)
 
     if not projects:
         print(f"❌ No projects found or invalid group/path: {group_id_or_path}")
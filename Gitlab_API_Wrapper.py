@@ -4,26 +4,29 @@ from dotenv import load_dotenv
 load_dotenv()  
 import os
 from datetime import datetime, timedelta
+from io import StringIO
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.fetch import make_api_request, fetch_paginated_data
 from utils.auth import get_gitlab_headers
-from apis.groups_api import get_all_users_from_group
+from apis.groups_api import get_all_users_from_group, read_usernames, bulk_manage_members, BULK_STATUS_ICONS
 from apis.projects_api import get_project_id
 from apis.merge_api import get_merge_requests, accept_merge_request
-from apis.commits_api import summarize_commit, get_commits_for_project, get_projects
+from apis.commits_api import get_commits_for_project, get_projects
+from utils.commit_classifier import summarize_batch
 from apis.issues_api import fetch_all_project_issues
-from apis.users_api import get_user_id as fetch_user_id
-import csv
-import requests
 import os
 from datetime import timezone, datetime, timedelta  
 from Issueboard.issueboard_automation import summarize_issue, parse_gitlab_date
 from apis.issues_api import (
     fetch_all_project_issues,
-    fetch_notes
+    fetch_notes_bulk,
+    fetch_group_issues,
+    issue_project_path
 
 )
-from utils.formatter import generate_summary
+from utils.formatter import render_summary
+from utils.search_index import MemberSearchIndex
 
  
 
@@ -40,6 +43,7 @@ token = os.getenv("GITLAB_TOKEN")
 GITLAB_API_URL = "https://code.swecha.org/api/v4"
 GITLAB_URL = "https://code.swecha.org"
 GITLAB_BASE_URL = "https://code.swecha.org/api/v4"
+COMMIT_FETCH_WORKERS = 8
 
 st.set_page_config(page_title="🚀 GitLab Wrapper UI", layout="wide")
 
@@ -87,16 +91,23 @@ def check_file_in_project(project_path, file_path):
 def run_issues():
     st.subheader("📊 GitLab Issues (Formatted)")
     
-    project_id = st.text_input("📥 Project ID:").strip()
+    scope = st.radio("Scope:", ["Project", "Group"], horizontal=True)
+    scope_id = st.text_input(f"📥 {scope} ID:").strip()
     days = int(st.text_input("📆 Days back (default 7):", "7").strip())
 
-    if not project_id:
+    if not scope_id:
         return
 
     since = (datetime.now() - timedelta(days=days)).isoformat()
     headers = {"PRIVATE-TOKEN": os.getenv("GITLAB_TOKEN")}
 
-    issues = fetch_all_project_issues(headers, project_id, since)
+    if scope == "Group":
+        # One paginated group-level query instead of one query per project
+        issues = fetch_group_issues(headers, scope_id, since)
+        for issue in issues:
+            issue["project"] = issue_project_path(issue)
+    else:
+        issues = fetch_all_project_issues(headers, scope_id, since)
 
     if not issues:
         st.warning("❌ No issues found.")
@@ -112,6 +123,9 @@ def run_issues():
     start_of_today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
     start_of_yesterday = start_of_today - timedelta(days=1)
 
+    with st.spinner(f"Fetching notes for {len(issues)} issue(s)..."):
+        notes = fetch_notes_bulk(headers, issues)
+
     for issue in issues:
         author = issue.get('author', {})
         name = author.get('name', 'Unknown')
@@ -123,7 +137,7 @@ def run_issues():
             continue
 
         # Add notes & ai_summary
-        issue["notes"] = fetch_notes(headers, issue["project_id"], issue["iid"])
+        issue["notes"] = notes.get(issue["id"], [])
         issue["ai_summary"] = summarize_issue(issue)
         labels = [lbl.lower() for lbl in issue.get("labels", [])]
 
@@ -136,10 +150,12 @@ def run_issues():
         elif start_of_yesterday <= updated_at < start_of_today and issue.get('state') != 'closed':
             final[name]["yesterday"].append(issue)
 
-    html_summary = generate_summary(final)
+    # st.components takes one string, so the rendered rows are streamed into a buffer
+    html_summary = StringIO()
+    render_summary(final, html_summary, heading=f"{scope}: {scope_id}")
 
     # Display the HTML in Streamlit
-    st.components.v1.html(html_summary, height=800, scrolling=True)
+    st.components.v1.html(html_summary.getvalue(), height=800, scrolling=True)
 
 def run_merge_requests():
     st.subheader("🔄 Merge Requests")
@@ -178,19 +194,20 @@ def run_check_file():
     else:
         st.error("❌ Project not found.")
 
+@st.cache_resource(ttl=600, show_spinner="Loading group members...")
+def load_member_index(group_id):
+    """Fetch a group's members once and index them for local keystroke search"""
+    return MemberSearchIndex(get_all_users_from_group(group_id))
+
 def search_group_members(group_id, query):
         if not group_id or not query:
             return []
 
-        url = f"{GITLAB_API_URL}/groups/{group_id}/members/all?query={quote(query)}"
-        headers = {"PRIVATE-TOKEN": os.getenv("GITLAB_TOKEN")}
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"❌ Error {response.status_code}: {response.text}")
+        index = load_member_index(group_id)
+        if not len(index):
+            st.error(f"❌ No members found for group {group_id}.")
             return []
+        return index.search(query)
 
 
 
@@ -203,9 +220,6 @@ if mode == "Get User ID":
     group_id = st.text_input("🏷️ Enter Group ID (e.g. 69994)").strip()
     partial_query = st.text_input("🔎 Enter part of a username or name").strip()
 
-    search_group_members(group_id,partial_query) 
-
-    
 
     if group_id and partial_query:
         matching = search_group_members(group_id, partial_query)
@@ -266,29 +280,52 @@ elif mode == "Get Commits":
                         st.success(f"✅ Found {len(projects)} project(s). Fetching commits...")
 
                         since_date = datetime.now() - timedelta(days=days_input)
+                        headers = get_gitlab_headers()
 
                         progress_bar = st.progress(0)
                         total_projects = len(projects)
 
-                        for idx, project in enumerate(projects):
-                            progress_bar.progress((idx + 1) / total_projects)
-
+                        # Lay out every expander first, then fill each one as its fetch lands
+                        placeholders = {}
+                        for project in projects:
                             with st.expander(f"📁 {project['name']}"):
-                                commits = get_commits_for_project(project["id"], since_date)
+                                placeholders[project["id"]] = st.empty()
+                                placeholders[project["id"]].caption("⏳ Fetching commits...")
+
+                        with ThreadPoolExecutor(max_workers=COMMIT_FETCH_WORKERS) as executor:
+                            futures = {
+                                executor.submit(get_commits_for_project, project["id"], since_date, headers): project
+                                for project in projects
+                            }
+                            for done, future in enumerate(as_completed(futures), start=1):
+                                progress_bar.progress(done / total_projects)
+                                slot = placeholders[futures[future]["id"]]
+                                try:
+                                    commits = future.result()
+                                except Exception as e:
+                                    slot.error(f"❌ Failed to fetch commits: {e}")
+                                    continue
 
                                 if not commits:
-                                    st.info(f"No commits in the last {days_input} days.")
-                                else:
+                                    slot.info(f"No commits in the last {days_input} days.")
+                                    continue
+
+                                summaries = summarize_batch([commit['title'] for commit in commits])
+                                with slot.container():
                                     st.write(f"**{len(commits)} commit(s) found:**")
-                                    for commit in commits:
-                                        st.markdown(
-                                            f"""
-                                            **{commit['title']}**  
-                                            👤 {commit['author_name']}  
-                                            📅 {commit['created_at'][:10]}  
-                                            {summarize_commit(commit['title'])}
-                                            """
-                                        )
+                                    st.dataframe(
+                                        [
+                                            {
+                                                "Title": commit['title'],
+                                                "Author": commit['author_name'],
+                                                "Date": commit['created_at'][:10],
+                                                "Summary": summary,
+                                            }
+                                            for commit, summary in zip(commits, summaries)
+                                        ],
+                                        use_container_width=True,
+                                        hide_index=True,
+                                    )
                         progress_bar.empty()
                         st.success("🎉 Completed fetching commits for all projects!")
 
@@ -307,33 +344,29 @@ elif mode == "Manage Group Members":
 
 
 
+    def run_bulk_member_action(group_id, uploaded_file, access_level, action):
+        usernames = read_usernames(uploaded_file.read().decode('utf-8').splitlines())
+        if not usernames:
+            st.warning("❌ No usernames found in the CSV.")
+            return
+        with st.spinner(f"Processing {len(usernames)} member(s)..."):
+            results = bulk_manage_members(group_id, usernames, access_level, action=action)
+
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        st.success(" | ".join(f"{BULK_STATUS_ICONS[status]} {status}: {count}" for status, count in counts.items()))
+        st.dataframe(
+            [{"": BULK_STATUS_ICONS[r["status"]], **r} for r in results],
+            use_container_width=True,
+            hide_index=True
+        )
+
     def add_members_to_group(group_id, uploaded_file, access_level=30):
-        reader = csv.DictReader(uploaded_file.read().decode('utf-8').splitlines())
-        for row in reader:
-            username = row["username"].strip()
-            user_id = fetch_user_id(username)
-            if not user_id:
-                st.error(f"❌ User '{username}' not found.")
-                continue
-            url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members"
-            data = {"user_id": user_id, "access_level": access_level}
-            response = make_api_request(url, get_gitlab_headers(), data=data)
-            if response:
-                st.success(f"✅ Added '{username}' to the group.")
+        run_bulk_member_action(group_id, uploaded_file, access_level, "add")
 
     def update_access_level(group_id, uploaded_file, level):
-        reader = csv.DictReader(uploaded_file.read().decode('utf-8').splitlines())
-        for row in reader:
-            username = row["username"].strip()
-            user_id = fetch_user_id(username)
-            if not user_id:
-                st.error(f"❌ User '{username}' not found.")
-                continue
-            url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members/{user_id}"
-            data = {"access_level": level}
-            response = make_api_request(url, get_gitlab_headers(), data=data)
-            if response:
-                st.success(f"🔄 Updated access level for '{username}'")
+        run_bulk_member_action(group_id, uploaded_file, level, "update")
 
     if group_id:
         if action == "List Members":
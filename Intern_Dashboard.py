@@ -1,3 +1,4 @@
+import contextlib
 import streamlit as st
 from datetime import datetime, timedelta
 from collections import defaultdict
@@ -8,7 +9,6 @@ from plotly.subplots import make_subplots
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dateutil.parser import parse as parse_datetime
-import time
 import re
 from urllib.parse import quote
 import json
@@ -17,10 +17,20 @@ import pytz
 from utils.validate_gitlab_token import validate_gitlab_token
 from apis.commits_api import get_gitlab_headers,safe_api_request
 from apis.vscode_validation_api import validate_gitlab_token,validate_group_access  # noqa: F811
-from apis.groups_api import get_group_members
+from apis.groups_api import get_members_for_groups
 from apis.projects_api import get_all_accessible_projects
 from apis.projects_api import get_project_activity
-from apis.users_api import check_readme_exists_api,fetch_readme_status
+from apis.users_api import check_readme_exists_api,fetch_readme_status,split_members_by_presence
+from apis.identity_api import build_identity_index
+from utils.activity_series import (
+    new_daily_counts, merge_daily_counts, series_length, total_series,
+    current_streak, longest_streak, week_over_week
+)
+from utils.metrics import in_current_run, start_run
+from utils.export import (
+    available_formats, export_rows, export_filename, dataframe_rows, dataframe_column_types,
+    ActivityEventSpool, EXPORT_FORMATS
+)
 
 # Timezone configuration for IST
 LOCAL_TIMEZONE = pytz.timezone('Asia/Kolkata')  # IST - Indian Standard Time
@@ -28,6 +38,21 @@ LOCAL_TIMEZONE = pytz.timezone('Asia/Kolkata')  # IST - Indian Standard Time
 # Configuration
 GITLAB_URL = "https://code.swecha.org"
 
+# Known intern cohorts
+GROUP_LABELS = {
+    "69994": "BITS Interns",
+    "72165": "ICFAI Interns",
+}
+
+# Commit author names that don't match a member's name or username -> member username
+NAME_ALIASES = {
+    "amar": "awmar",
+    "Prem-Kowshik": "premk",
+    "Phanindra Varma": "phanindra_varma",
+    "sailadachetansurya": "ChetanSurya",
+    # Add more aliases as needed
+}
+
 # Enhanced styling
 st.set_page_config(
     page_title="GitLab Analytics Dashboard",
@@ -133,9 +158,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize session state
-if 'start_time' not in st.session_state:
-    st.session_state.start_time = time.time()
-
 if 'gitlab_token' not in st.session_state:
     st.session_state.gitlab_token = ""
 
@@ -220,7 +242,7 @@ st.sidebar.markdown("## ⚙️ Group Selection")
 st.session_state.setdefault("group_id", None)
 
 # Sidebar option to choose input method
-group_input_method = st.sidebar.radio("Choose Group Input Method", ["Single Group"])
+group_input_method = st.sidebar.radio("Choose Group Input Method", ["Single Group", "Multiple Groups"])
 
 # Handle group ID input via buttons
 if group_input_method == "Single Group":
@@ -240,11 +262,11 @@ if group_input_method == "Single Group":
 else:
     group_ids_text = st.sidebar.text_area(
         "🏢 GitLab Group IDs",
-        value="69994",
+        value="\n".join(GROUP_LABELS),
         placeholder="Enter group IDs, one per line:\n69994\n12345\n67890",
         help="Enter multiple group IDs, one per line"
     )
-    group_ids = [gid.strip() for gid in group_ids_text.split('\n') if gid.strip() and gid.strip().isdigit()]
+    group_ids = list(dict.fromkeys(gid.strip() for gid in group_ids_text.split('\n') if gid.strip() and gid.strip().isdigit()))
 
 if not group_ids:
     st.sidebar.info("Please enter at least one valid numeric group ID")
@@ -288,8 +310,16 @@ st.sidebar.markdown("### 📊 Analysis Options")
 include_comments = st.sidebar.checkbox("Include comments in activity", value=True)
 use_project_based = st.sidebar.checkbox("Use project-based analysis", value=True, 
                                         help="Analyze activities from all accessible projects")
+skip_idle_members = st.sidebar.checkbox("Skip idle members", value=True,
+                                        help="Members whose GitLab last activity is before the analysis period are marked idle and skipped in attribution and README checks")
 show_project_list = st.sidebar.checkbox("Show all available projects", value=False,
                                         help="Display a list of all accessible projects")
+record_raw_activity = st.sidebar.checkbox("Record raw activity for export", value=False,
+                                          help="Spool every attributed commit, MR, issue and push event to disk so it can be downloaded")
+export_format = st.sidebar.selectbox("📦 Export format", available_formats(),
+                                     help="Reports are streamed to the chosen format in batches")
+prepare_exports = st.sidebar.checkbox("Prepare downloads", value=False,
+                                      help="Build the export files on each run; leave off to skip that work when nobody downloads")
 
 st.sidebar.markdown("---")
 
@@ -319,6 +349,15 @@ if st.sidebar.button("🧪 Test API Connection"):
 
 # Main application logic
 def main():
+    # The raw activity spool's temporary file is closed however the run ends,
+    # early returns and Streamlit's stop/rerun exceptions included
+    with (ActivityEventSpool() if record_raw_activity else contextlib.nullcontext()) as activity_spool:
+        render_dashboard(activity_spool)
+
+def render_dashboard(activity_spool):
+    # Timings and API accounting are collected per run, not per session
+    run_metrics = start_run()
+    
     # Check if token is available
     headers = get_gitlab_headers()
     if not headers:
@@ -331,34 +370,31 @@ def main():
         return
     
     since_date = datetime.now() - timedelta(days=days)
+    n_days = series_length(since_date)
     
     st.info(f"📅 Analyzing activities from {since_date.strftime('%Y-%m-%d')} to {datetime.now().strftime('%Y-%m-%d')}")
     
-    # Load group members
-    # Load members from all groups
-    all_members = []
+    # Load members from all groups concurrently; members are deduplicated by user ID
+    run_metrics.begin("member_load")
     with st.spinner(f"🔍 Loading members from {len(group_ids)} group(s)..."):
-        for gid in group_ids:
-            members_result = get_group_members(gid)
-            if members_result["success"]:
-                all_members.extend(members_result["data"])
-                st.success(f"✅ Found {len(members_result['data'])} members in group {gid}")
-            else:
-                st.error(f"❌ Failed to load group {gid}: {members_result['error']}")
+        members_result = get_members_for_groups(group_ids)
 
-    # Remove duplicates based on user ID
-    seen_users = set()
-    members = []
-    for member in all_members:
-        if member["id"] not in seen_users:
-            members.append(member)
-            seen_users.add(member["id"])
+    for gid, error in members_result.get("errors", {}).items():
+        st.error(f"❌ Failed to load group {gid}: {error}")
 
-    if not members:
+    if not members_result["success"] or not members_result["data"]:
         st.error("❌ No members found in any of the specified groups")
         return
+
+    members = members_result["data"]
+    group_member_ids = members_result["groups"]
+    for gid, member_ids in group_member_ids.items():
+        st.success(f"✅ Found {len(member_ids)} members in group {GROUP_LABELS.get(gid, gid)}")
+    if len(group_member_ids) > 1:
+        st.info(f"👥 {len(members)} unique members across {len(group_member_ids)} groups - shared projects are scanned once")
     
     # Load projects if requested
+    run_metrics.begin("project_catalog")
     projects = []
     if use_project_based or show_project_list:
         with st.spinner("📁 Loading accessible projects..."):
@@ -371,10 +407,12 @@ def main():
             else:
                 return
         else:
-            projects = projects_result["data"]
+            # Scan each project once, even if paging shifted it across pages or several cohorts share it
+            projects = list({project["id"]: project for project in projects_result["data"]}.values())
             st.success(f"📁 Found {len(projects)} accessible projects")
     
     # Show project list if requested
+    run_metrics.begin("render")
     if show_project_list and projects:
         st.markdown("## 📁 All Available Projects")
         
@@ -400,8 +438,7 @@ def main():
         st.info(f"Showing {len(filtered_projects)} projects" + (f" (filtered from {len(projects)})" if search_term else ""))
         
         # Display projects in a nice format
-        project_data = []
-        for project in filtered_projects[:100]:  # Limit display to 100 projects
+        def project_row(project):
             last_activity = "Never"
             if project.get('last_activity_at'):
                 try:
@@ -410,7 +447,7 @@ def main():
                 except:
                     last_activity = project.get('last_activity_at', 'Never')
             
-            project_data.append({
+            return {
                 "Name": project['name'],
                 "ID": project['id'],
                 "Description": (project.get('description') or 'No description')[:100] + ("..." if len(project.get('description') or '') > 100 else ""),
@@ -419,7 +456,9 @@ def main():
                 "Stars": project.get('star_count', 0),
                 "Forks": project.get('forks_count', 0),
                 "Web URL": project.get('web_url', '')
-            })
+            }
+        
+        project_data = [project_row(project) for project in filtered_projects[:100]]  # Limit display to 100 projects
         
         if project_data:
             projects_df = pd.DataFrame(project_data)
@@ -440,25 +479,42 @@ def main():
                 }
             )
             
-            # Download projects list
-            projects_csv = projects_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Projects List",
-                data=projects_csv,
-                file_name=f"gitlab_projects_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+            # Download projects list (all filtered projects, not just the displayed ones)
+            if prepare_exports:
+                st.download_button(
+                    label="📥 Download Projects List",
+                    data=export_rows(
+                        (project_row(project) for project in filtered_projects),
+                        list(projects_df.columns),
+                        export_format
+                    ),
+                    file_name=export_filename("gitlab_projects", export_format, datetime.now().strftime('%Y%m%d_%H%M%S')),
+                    mime=EXPORT_FORMATS[export_format]["mime"]
+                )
         
         st.markdown("---")
     
-    # Create valid names set
-    valid_names = {member["name"] for member in members}
+    # Presence pass: members GitLab reports as idle since since_date cannot have activity in the window
+    attributable_members = members
+    idle_ids = set()
+    if skip_idle_members:
+        run_metrics.begin("presence")
+        with st.spinner("👀 Checking member presence..."):
+            attributable_members, idle_members = split_members_by_presence(members, since_date, debug_mode=debug_mode)
+        idle_ids = {member["id"] for member in idle_members}
+        if idle_members:
+            st.info(f"💤 {len(idle_members)} member(s) have no GitLab activity since {since_date.strftime('%Y-%m-%d')} and are skipped in attribution and README checks")
+    
+    # Resolve every author identity (user id, username, name, alias, commit email) to a member id
+    run_metrics.begin("identity_index")
+    with st.spinner("🪪 Building member identity index..."):
+        identity_index = build_identity_index(attributable_members, aliases=NAME_ALIASES, debug_mode=debug_mode)
     
     if debug_mode:
         st.markdown(f"""
         <div class="debug-info">
             <strong>Debug Info:</strong><br>
-            - Group ID: {group_id}<br>
+            - Group IDs: {", ".join(group_ids)}<br>
             - GitLab URL: {GITLAB_URL}<br>
             - Members found: {len(members)}<br>
             - Projects found: {len(projects)}<br>
@@ -466,12 +522,12 @@ def main():
             - Since date: {since_date.isoformat()}<br>
             - Using project-based analysis: {use_project_based}
         </div>
-        """, unsafe_allow_html=True)  # noqa: F821
+        """, unsafe_allow_html=True)
     
     # Initialize user stats with all group members
     user_stats = {}
     for member in members:
-        user_stats[member["name"]] = {
+        user_stats[member["id"]] = {
             "username": member["username"],
             "user_id": member["id"],
             "name": member["name"],
@@ -482,13 +538,14 @@ def main():
             "push_events": 0,
             "projects": set(),
             "last_activity": None,
-            "commit_dates": [],
-            "mr_dates": [],
-            "issue_dates": [],
+            "daily": new_daily_counts(n_days),
             "activity_details": []
         }
     
-    if use_project_based and projects:
+    # Raw per-event rows are spooled to disk as projects finish, never held in full
+    run_metrics.begin("activity_scan")
+    
+    if use_project_based and projects and attributable_members:
         # Project-based analysis
         st.markdown("### 🔄 Processing Project Activities...")
         
@@ -505,31 +562,40 @@ def main():
         
         def process_project_wrapper(args):
             project, index = args
+            project_events = [] if activity_spool is not None else None
             project_stats = get_project_activity(
                 project["id"], 
                 project["name"], 
                 since_date, 
-                valid_names
+                identity_index,
+                n_days=n_days,
+                events=project_events
             )
-            return project_stats, index, project["name"]
+            return project_stats, index, project["name"], project_events
+
+        def merge_project_stats(project_stats, project_events=None):
+            if project_events:
+                activity_spool.append(project_events)
+            for user, stats in project_stats.items():
+                if user in user_stats:
+                    user_data = user_stats[user]
+                    user_data["commits"] += stats["commits"]
+                    user_data["merge_requests"] += stats["merge_requests"]
+                    user_data["issues"] += stats["issues"]
+                    user_data["push_events"] += stats["push_events"]
+                    user_data["projects"].update(stats["project_names"])
+                    merge_daily_counts(user_data["daily"], stats["daily"])
+                    
+                    if not user_data["last_activity"] or (stats["last_activity"] and stats["last_activity"] > user_data["last_activity"]):
+                        user_data["last_activity"] = stats["last_activity"]
         
         if debug_mode:
             # Sequential processing for debugging
             for i, project in enumerate(projects_to_analyze):
-                project_stats, _, project_name = process_project_wrapper((project, i))
+                project_stats, _, project_name, project_events = process_project_wrapper((project, i))
                 
                 # Update user stats
-                for user, stats in project_stats.items():
-                    if user in user_stats:
-                        user_data = user_stats[user]
-                        user_data["commits"] += stats["commits"]
-                        user_data["merge_requests"] += stats["merge_requests"]
-                        user_data["issues"] += stats["issues"]
-                        user_data["push events"].update(stats["push_events"])
-                        user_data["projects"].update(stats["project_names"])
-                        
-                        if not user_data["last_activity"] or (stats["last_activity"] and stats["last_activity"] > user_data["last_activity"]):
-                            user_data["last_activity"] = stats["last_activity"]
+                merge_project_stats(project_stats, project_events)
                 
                 progress = (i + 1) / len(projects_to_analyze)
                 progress_bar.progress(progress)
@@ -538,25 +604,16 @@ def main():
             # Parallel processing for speed
             with ThreadPoolExecutor(max_workers=6) as executor:
                 project_args = [(project, i) for i, project in enumerate(projects_to_analyze)]
-                futures = {executor.submit(process_project_wrapper, args): args for args in project_args}
+                task = in_current_run(process_project_wrapper)
+                futures = {executor.submit(task, args): args for args in project_args}
                 
                 completed = 0
                 for future in as_completed(futures):
                     try:
-                        project_stats, index, project_name = future.result()
+                        project_stats, index, project_name, project_events = future.result()
                         
                         # Update user stats
-                        for user, stats in project_stats.items():
-                            if user in user_stats:
-                                user_data = user_stats[user]
-                                user_data["commits"] += stats["commits"]
-                                user_data["merge_requests"] += stats["merge_requests"]
-                                user_data["issues"] += stats["issues"]
-                                user_data["push_events"] += stats["push_events"]
-                                user_data["projects"].update(stats["project_names"])
-                                
-                                if not user_data["last_activity"] or (stats["last_activity"] and stats["last_activity"] > user_data["last_activity"]):
-                                    user_data["last_activity"] = stats["last_activity"]
+                        merge_project_stats(project_stats, project_events)
                         
                         completed += 1
                         progress = completed / len(projects_to_analyze)
@@ -576,6 +633,7 @@ def main():
         st.info("⚠️ Project-based analysis is disabled. Limited data may be available.")
     
     # Calculate comprehensive statistics
+    run_metrics.begin("aggregation")
     total_members = len(user_stats)
     active_members = sum(1 for stats in user_stats.values() 
                         if (stats["commits"] + stats["merge_requests"] + stats["issues"]) >= activity_threshold)
@@ -618,6 +676,7 @@ def main():
         - Group members don't have access to projects being analyzed
         """)
         # Display comprehensive metrics
+    run_metrics.begin("render")
     st.markdown("## 📊 Overall Statistics")
     
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -691,6 +750,44 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    # Per-group breakdown from the single crawl
+    if len(group_member_ids) > 1:
+        st.markdown("## 🏢 Group Comparison")
+        
+        group_rows = []
+        for gid, member_ids in group_member_ids.items():
+            group_users = [stats for stats in user_stats.values() if stats["user_id"] in member_ids]
+            group_active = sum(1 for stats in group_users
+                               if (stats["commits"] + stats["merge_requests"] + stats["issues"]) >= activity_threshold)
+            group_projects = set()
+            for stats in group_users:
+                group_projects.update(stats["projects"])
+            group_rows.append({
+                "Group": GROUP_LABELS.get(gid, gid),
+                "Group ID": gid,
+                "Members": len(group_users),
+                "Active Members": group_active,
+                "Activity Rate %": round(group_active / len(group_users) * 100, 1) if group_users else 0.0,
+                "Commits": sum(stats["commits"] for stats in group_users),
+                "Merge Requests": sum(stats["merge_requests"] for stats in group_users),
+                "Issues": sum(stats["issues"] for stats in group_users),
+                "Push Events": sum(stats["push_events"] for stats in group_users),
+                "Active Projects": len(group_projects)
+            })
+        
+        groups_df = pd.DataFrame(group_rows)
+        st.dataframe(groups_df, use_container_width=True, hide_index=True)
+        
+        fig_groups = px.bar(
+            groups_df,
+            x="Group",
+            y=["Commits", "Merge Requests", "Issues", "Push Events"],
+            barmode="group",
+            title="🏢 Activity by Group",
+            labels={"value": "Activities", "variable": "Type"}
+        )
+        st.plotly_chart(fig_groups, use_container_width=True)
+    
     # Filter users based on activity threshold and show_inactive setting
     filtered_users = {}
     for user, stats in user_stats.items():
@@ -732,10 +829,15 @@ def main():
             last_activity_str = "Never"
             days_since_activity = "N/A"
         
+        daily_total = total_series(stats["daily"])
+        wow_change = week_over_week(daily_total)
+        
         if activity_threshold > 0 :
             status = "🟢 Active" if total_activity >= activity_threshold else "🔴 Inactive"
         else: 
             status = "🟢 Active" if total_activity > activity_threshold else "🔴 Inactive"
+        if stats["user_id"] in idle_ids:
+            status = "💤 Idle"
         
         user_data.append({
             "Name": stats["name"],
@@ -750,46 +852,43 @@ def main():
             "Project names": stats["projects"],
 
             # "Last Activity": last_activity_str,
-            "Days Since Activity": days_since_activity
+            "Days Since Activity": days_since_activity,
+            "Current Streak": current_streak(daily_total),
+            "Longest Streak": longest_streak(daily_total),
+            "WoW Change %": round(wow_change, 1) if wow_change is not None else None
         })
     
     # Sort by total activity
     user_data.sort(key=lambda x: x["Total Activity"], reverse=True)
 
 
-# Add README status check
-    name_to_username = {}
-
-# First, create the basic mapping from member data (name -> username)
-    for member in members:
-        name_to_username[member["name"]] = member["username"]
-
-# Add any additional custom mappings for special cases
-    custom_mappings = {
-        "amar": "awmar",
-        "Prem-Kowshik": "premk", 
-        "Phanindra Varma": "phanindra_varma",
-        "sailadachetansurya": "ChetanSurya",
-    # Add more custom mappings as needed
-    }
-
-    name_to_username.update(custom_mappings)
-        
-        # Get README status for all users
-    usernames = [data["Name"] for data in user_data]
-    readme_status_map = fetch_readme_status(usernames, name_to_username)
+# Add README status check - rows already carry the member's username
+    idle_usernames = {user_stats[user_id]["username"] for user_id in idle_ids}
+    usernames = [data["Username"] for data in user_data if data["Username"] not in idle_usernames]
+    run_metrics.begin("readme_check")
+    # Profile projects (username/username) already in the catalog let the cache spot README changes for free
+    profile_activity = {}
+    for project in projects:
+        namespace, _, path = (project.get("path_with_namespace") or "").lower().partition("/")
+        if namespace and namespace == path:
+            profile_activity[namespace] = project.get("last_activity_at")
+    readme_status_map = fetch_readme_status(usernames, {username: username for username in usernames}, profile_activity=profile_activity)
+    run_metrics.begin("render")
         
         # Add README column to user data
     for data in user_data:
-        data["README"] = readme_status_map.get(data["Name"], "❌")
+        data["README"] = "➖ (idle)" if data["Username"] in idle_usernames else readme_status_map.get(data["Username"], "❌")
 
     if debug_mode:
-        st.write("### 🔍 Name to Username Mapping")
-        mapping_df = pd.DataFrame([
-            {"Name": name, "Username": username} 
-            for name, username in name_to_username.items()
-        ])
-        st.dataframe(mapping_df, use_container_width=True)
+        st.write("### 🔍 Identity Index")
+        st.dataframe(pd.DataFrame(identity_index.identities()), use_container_width=True)
+        
+        if identity_index.unresolved:
+            st.write("### ❓ Unresolved Commit Authors")
+            st.dataframe(pd.DataFrame([
+                {"Author Name": name, "Author Email": email, "Commits": count}
+                for (name, email), count in identity_index.unresolved.most_common(50)
+            ]), use_container_width=True)
     
     if user_data:
         users_df = pd.DataFrame(user_data)
@@ -821,18 +920,35 @@ def main():
                 
                 "Projects": st.column_config.NumberColumn("🗂️ Projects", width="small"),
                 # "Last Activity": st.column_config.TextColumn("🕒 Last Activity", width="medium"),
-                "Days Since Activity": st.column_config.TextColumn("📅 Days Ago", width="medium")
+                "Days Since Activity": st.column_config.TextColumn("📅 Days Ago", width="medium"),
+                "Current Streak": st.column_config.NumberColumn("🔥 Streak", width="small"),
+                "Longest Streak": st.column_config.NumberColumn("🏅 Best Streak", width="small"),
+                "WoW Change %": st.column_config.NumberColumn("📈 WoW %", width="small", format="%.1f%%")
             },
         )
         
-        # Download button for user data
-        users_csv = users_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download User Report",
-            data=users_csv,
-            file_name=f"gitlab_user_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+        # Download buttons for user data; the files are only built when asked for
+        report_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if not prepare_exports:
+            st.caption("📦 Tick 'Prepare downloads' in the sidebar to export these reports.")
+        else:
+            st.download_button(
+                label="📥 Download User Report",
+                data=export_rows(
+                    dataframe_rows(users_df), list(users_df.columns), export_format,
+                    column_types=dataframe_column_types(users_df)
+                ),
+                file_name=export_filename("gitlab_user_report", export_format, report_timestamp),
+                mime=EXPORT_FORMATS[export_format]["mime"]
+            )
+
+            if activity_spool is not None:
+                st.download_button(
+                    label=f"📥 Download Raw Activity ({activity_spool.count} events)",
+                    data=activity_spool.export(export_format),
+                    file_name=export_filename("gitlab_raw_activity", export_format, report_timestamp),
+                    mime=EXPORT_FORMATS[export_format]["mime"]
+                )
     
     # Create visualizations
     st.markdown("## 📈 Data Visualizations")
@@ -1019,6 +1135,53 @@ def main():
                 showlegend=False
             )
             st.plotly_chart(fig_timeline, use_container_width=True)
+        
+        # Contribution heatmap from the per-day counters collected during the scan
+        st.markdown("### 🔥 Contribution Heatmap")
+        
+        day_labels = [(since_date + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(n_days)]
+        heatmap_users = sorted(
+            filtered_users.values(),
+            key=lambda s: s["commits"] + s["merge_requests"] + s["issues"] + s["push_events"],
+            reverse=True
+        )[:25]
+        heatmap_rows = [total_series(stats["daily"]) for stats in heatmap_users]
+        
+        if heatmap_rows and any(row.any() for row in heatmap_rows):
+            fig_heatmap = go.Figure(data=go.Heatmap(
+                z=[row.tolist() for row in heatmap_rows],
+                x=day_labels,
+                y=[stats["name"] for stats in heatmap_users],
+                colorscale="Greens",
+                hovertemplate="%{y}<br>%{x}: %{z} activities<extra></extra>"
+            ))
+            fig_heatmap.update_layout(
+                title="🔥 Daily Contributions - Top 25 Users",
+                height=max(400, len(heatmap_users) * 25),
+                yaxis={'autorange': 'reversed'}
+            )
+            st.plotly_chart(fig_heatmap, use_container_width=True)
+            
+            # Cohort-wide weekly trend by activity type
+            trend_df = pd.DataFrame({
+                "Date": pd.to_datetime(day_labels),
+                "Commits": sum(stats["daily"]["commits"] for stats in filtered_users.values()),
+                "Merge Requests": sum(stats["daily"]["merge_requests"] for stats in filtered_users.values()),
+                "Issues": sum(stats["daily"]["issues"] for stats in filtered_users.values()),
+                "Push Events": sum(stats["daily"]["push_events"] for stats in filtered_users.values()),
+            })
+            weekly_df = trend_df.resample("W-" + since_date.strftime('%a').upper(), on="Date", label="left", closed="left").sum().reset_index()
+            fig_trend = px.line(
+                weekly_df,
+                x="Date",
+                y=["Commits", "Merge Requests", "Issues", "Push Events"],
+                markers=True,
+                title="📈 Week-over-Week Activity Trend",
+                labels={"value": "Activities", "Date": "Week starting", "variable": "Type"}
+            )
+            st.plotly_chart(fig_trend, use_container_width=True)
+        else:
+            st.info("No dated activity found in the selected period.")
     
     # Summary insights
     st.markdown("## 💡 Key Insights")
@@ -1051,9 +1214,38 @@ def main():
         st.info(insight)
     
     # Performance metrics
-    execution_time = time.time() - st.session_state.start_time
+    run_metrics.finish()
+    execution_time = run_metrics.elapsed
+    
+    if debug_mode:
+        st.markdown("### ⏱️ Stage Timings & API Accounting")
+        stage_rows = run_metrics.rows()
+        st.dataframe(
+            pd.DataFrame(stage_rows),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "stage": st.column_config.TextColumn("Stage", width="medium"),
+                "wall_time_s": st.column_config.NumberColumn("⏱️ Wall Time (s)", format="%.3f"),
+                "requests": st.column_config.NumberColumn("🌐 Requests"),
+                "bytes": st.column_config.NumberColumn("📦 Bytes"),
+                "retries": st.column_config.NumberColumn("🔁 Retries"),
+                "errors": st.column_config.NumberColumn("⚠️ Errors"),
+                "cache_hits": st.column_config.NumberColumn("Cache Hits"),
+                "cache_misses": st.column_config.NumberColumn("Cache Misses"),
+                "cache_hit_ratio": st.column_config.NumberColumn("🎯 Hit Ratio", format="%.2f")
+            }
+        )
+        st.download_button(
+            label="📥 Download Run Metrics (JSON)",
+            data=run_metrics.to_json(),
+            file_name=f"dashboard_run_metrics_{run_metrics.started_at.strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
+    
     st.markdown("---")
-    st.caption(f"⏱️ Dashboard generated in {execution_time:.2f} seconds | 📅 Data as of {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    total_requests = sum(row["requests"] for row in run_metrics.rows())
+    st.caption(f"⏱️ Dashboard generated in {execution_time:.2f} seconds ({total_requests} API requests) | 📅 Data as of {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 # Run the main application
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+import json
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from utils.formatter import generate_summary
+
+DIGEST_WORKERS = 4
+SMTP_BATCH_SIZE = 20
+SMTP_BATCH_PAUSE = 1.0
+SMTP_RETRIES = 3
+
+
+def load_recipients(path):
+    """Read a {"recipient@example.com": ["username", ...]} JSON file.
+
+    A mentor lists their interns; an intern lists only themselves.
+    """
+    with open(path, encoding="utf-8") as f:
+        recipients = json.load(f)
+    return {
+        email: [who] if isinstance(who, str) else list(who)
+        for email, who in recipients.items()
+    }
+
+def select_members(final, members, wanted):
+    """The part of a categorized standup covering the given usernames or names"""
+    names_by_username = {member['username'].lower(): member['name'] for member in members}
+    selected = {}
+    for who in wanted:
+        name = names_by_username.get(who.lower(), who)
+        if name in final:
+            selected[name] = final[name]
+    return selected
+
+def render_digests(final, members, recipients, heading, max_workers=DIGEST_WORKERS):
+    """Render one summary per recipient concurrently; returns [(recipient, html)]"""
+    def render(item):
+        email, wanted = item
+        return email, generate_summary(select_members(final, members, wanted), heading=heading)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(render, recipients.items()))
+
+def build_message(sender, recipient, subject, html_summary):
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg['To'] = recipient
+    msg.attach(MIMEText(html_summary, 'html'))
+    return msg
+
+
+class DigestMailer:
+    """Sends many messages over one authenticated SMTP connection.
+
+    The connection is opened lazily, reused for every message and reopened
+    only after the server drops it. Transient (4xx) failures are retried
+    with backoff; a pause between batches keeps providers' rate limits
+    happy. With ``starttls=False`` and no password it talks plain SMTP, so
+    it can be pointed at a local stand-in such as
+    ``python -m aiosmtpd -n -l localhost:1025``.
+    """
+
+    def __init__(self, host, port, sender, password="", starttls=True,
+                 batch_size=SMTP_BATCH_SIZE, batch_pause=SMTP_BATCH_PAUSE, retries=SMTP_RETRIES):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.starttls = starttls
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.retries = retries
+        self.server = None
+
+    def connect(self):
+        self.server = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.starttls:
+            self.server.starttls()
+        if self.password:
+            self.server.login(self.sender, self.password)
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                self.server.close()
+            self.server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send(self, msg):
+        for attempt in range(self.retries):
+            try:
+                if self.server is None:
+                    self.connect()
+                self.server.send_message(msg)
+                return
+            except smtplib.SMTPRecipientsRefused:
+                raise
+            except smtplib.SMTPResponseException as e:
+                # 5xx is permanent (bad address, rejected content): retrying will not help
+                if e.smtp_code >= 500:
+                    raise
+                self.close()
+            except OSError:
+                # Dropped or refused connection (SMTPServerDisconnected included): reconnect
+                if self.server is not None:
+                    self.server.close()
+                self.server = None
+            if attempt < self.retries - 1:
+                time.sleep(2 ** attempt)
+        raise smtplib.SMTPException(f"giving up on {msg['To']} after {self.retries} attempts")
+
+    def send_all(self, messages):
+        """Send every message; returns {recipient: error} for those that failed"""
+        failures = {}
+        for position, msg in enumerate(messages):
+            if position and position % self.batch_size == 0:
+                time.sleep(self.batch_pause)
+            try:
+                self.send(msg)
+            except (smtplib.SMTPException, OSError) as e:
+                failures[msg['To']] = str(e)
+        return failures
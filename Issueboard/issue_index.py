@@ -0,0 +1,83 @@
+import re
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class IssueIndex:
+    """In-memory lookups over one fetch of a project's issues.
+
+    Replaces the per-member assignee/username/author/all-issues requests:
+    every member is categorized from these indexes instead.
+    """
+
+    def __init__(self, issues):
+        self.issues = {}
+        self.by_assignee_id = defaultdict(list)
+        self.by_assignee_username = defaultdict(list)
+        self.by_author_id = defaultdict(list)
+        self.by_token = defaultdict(set)
+        self._text = {}
+        self._containing = {}
+
+        for issue in issues:
+            issue_id = issue["id"]
+            if issue_id in self.issues:
+                continue
+            self.issues[issue_id] = issue
+
+            assignees = list(issue.get("assignees") or [])
+            if issue.get("assignee") and issue["assignee"] not in assignees:
+                assignees.append(issue["assignee"])
+            for assignee in assignees:
+                self.by_assignee_id[assignee.get("id")].append(issue_id)
+                self.by_assignee_username[(assignee.get("username") or "").lower()].append(issue_id)
+
+            author = issue.get("author") or {}
+            self.by_author_id[author.get("id")].append(issue_id)
+
+            title = (issue.get("title") or "").lower()
+            desc = (issue.get("description") or "").lower()
+            self._text[issue_id] = (title, desc)
+            for token in set(tokenize(title)) | set(tokenize(desc)):
+                self.by_token[token].add(issue_id)
+
+    def __len__(self):
+        return len(self.issues)
+
+    def _issues_containing(self, fragment):
+        """Issues with an indexed token that contains `fragment` ("ravi" finds "ravikumar")"""
+        if fragment not in self._containing:
+            matches = set()
+            for token, issue_ids in self.by_token.items():
+                if fragment in token:
+                    matches |= issue_ids
+            self._containing[fragment] = matches
+        return self._containing[fragment]
+
+    def mentioning(self, name):
+        """Issues whose title or description contains the full name, even inside a longer word"""
+        tokens = tokenize(name)
+        if not tokens:
+            return []
+        # Every name token lies inside some indexed token of a matching text,
+        # so intersecting by containment never drops a match; the substring
+        # test below then removes the false positives
+        candidates = set.intersection(*(self._issues_containing(token) for token in tokens))
+        needle = name.lower()
+        return [
+            issue_id for issue_id in candidates
+            if needle in self._text[issue_id][0] or needle in self._text[issue_id][1]
+        ]
+
+    def issues_for_member(self, member):
+        """Issues assigned to, authored by or mentioning a member, without duplicates"""
+        issue_ids = dict.fromkeys(self.by_assignee_id.get(member["id"], []))
+        issue_ids.update(dict.fromkeys(self.by_assignee_username.get(member["username"].lower(), [])))
+        issue_ids.update(dict.fromkeys(self.by_author_id.get(member["id"], [])))
+        issue_ids.update(dict.fromkeys(sorted(self.mentioning(member["name"]))))
+        return [self.issues[issue_id] for issue_id in issue_ids]
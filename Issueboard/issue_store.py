@@ -0,0 +1,96 @@
+import json
+import os
+import sqlite3
+from datetime import timedelta
+
+from utils.cache import CACHE_DIR
+
+STORE_PATH = os.path.join(CACHE_DIR, "issue_store.sqlite3")
+
+# Re-read a little before the watermark so clock skew or slow commits on
+# the GitLab side never drop an update; upserts make the overlap harmless
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    scope TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    PRIMARY KEY (scope, id)
+);
+CREATE INDEX IF NOT EXISTS issues_updated ON issues (scope, updated_at);
+CREATE TABLE IF NOT EXISTS watermarks (
+    scope TEXT PRIMARY KEY,
+    updated_after TEXT NOT NULL
+);
+"""
+
+
+class IssueStore:
+    """Local SQLite copy of a project's or group's issues and their notes.
+
+    Each run only asks GitLab for issues updated after the scope's
+    watermark, refreshes notes for just those issues, and renders the
+    standup from the store.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def watermark(self, scope):
+        row = self.conn.execute(
+            "SELECT updated_after FROM watermarks WHERE scope = ?", (scope,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, scope, updated_after):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO watermarks (scope, updated_after) VALUES (?, ?)",
+                (scope, updated_after),
+            )
+
+    def upsert(self, scope, issues, notes):
+        """Store changed issues with their notes (keyed by issue id)"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO issues (scope, id, updated_at, data, notes) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (scope, issue["id"], issue.get("updated_at") or "",
+                     json.dumps(issue), json.dumps(notes.get(issue["id"], [])))
+                    for issue in issues
+                ],
+            )
+
+    def issues(self, scope, updated_since):
+        """Stored issues updated at or after `updated_since`, with their notes attached"""
+        rows = self.conn.execute(
+            "SELECT data, notes FROM issues WHERE scope = ? AND updated_at >= ? ORDER BY updated_at DESC",
+            (scope, updated_since),
+        )
+        issues = []
+        for data, notes in rows:
+            issue = json.loads(data)
+            issue["notes"] = json.loads(notes)
+            issues.append(issue)
+        return issues
+
+    def prune(self, scope, older_than):
+        """Drop issues last updated before `older_than`; they can no longer appear in a standup"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM issues WHERE scope = ? AND updated_at < ?", (scope, older_than)
+            )
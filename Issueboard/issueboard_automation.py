@@ -7,15 +7,20 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 
+import requests
 from dotenv import load_dotenv
 
 from apis.issues_api import (
-    fetch_project_info, fetch_project_members, fetch_issues,
-    fetch_issues_by_username, fetch_authored_issues,
-    fetch_all_project_issues, fetch_notes
+    fetch_project_info, fetch_project_members,
+    fetch_all_project_issues, fetch_notes, fetch_notes_bulk,
+    fetch_group_info, fetch_group_members, fetch_group_issues,
+    issue_project_path
 )
+from Issueboard.issue_index import IssueIndex
+from Issueboard.issue_store import IssueStore, WATERMARK_OVERLAP
+from Issueboard.digest import DigestMailer, build_message, load_recipients, render_digests
 
-from utils.formatter import generate_summary
+from utils.formatter import render_summary
 
 load_dotenv()
 
@@ -27,6 +32,8 @@ SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
 SENDER_EMAIL = os.getenv('SENDER_EMAIL', '')
 SENDER_PASSWORD = os.getenv('SENDER_PASSWORD', '')
 RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL', '')
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'true').lower() != 'false'
+SUMMARY_PATH = "standup_summary.html"
 
 def clean_text(text):
     if not isinstance(text, str):
@@ -69,64 +76,98 @@ def summarize_issue(issue):
         return "No significant updates."
 
 
-def enrich_issue(issue, project_name, headers):
+def enrich_issue(issue, project_name, headers, notes=None):
     issue['project'] = project_name
     issue['labels'] = issue.get('labels', [])
     issue['status'] = issue.get('state', '').capitalize()
-    issue['notes'] = fetch_notes(headers, issue['project_id'], issue['iid'])
+    if notes is None:
+        try:
+            notes = fetch_notes(headers, issue['project_id'], issue['iid'])
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Failed to fetch notes for issue {issue['iid']}: {e}")
+            notes = []
+    issue['notes'] = notes
     issue['ai_summary'] = summarize_issue(issue)
     return issue
 
-def main(project_id):
-    headers = {"PRIVATE-TOKEN": GITLAB_TOKEN}
+def gitlab_timestamp(dt):
+    """Format a UTC datetime like GitLab's updated_at, so stored timestamps compare as strings"""
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
 
-    now = datetime.now(timezone.utc)
-    since = (now - timedelta(days=2)).isoformat()
+def sync_issues(store, scope, fetch_changed, headers, now):
+    """Bring the store up to date and return the issues a standup needs.
 
-    project = fetch_project_info(headers, project_id)
-    if not project:
-        print("Invalid project ID")
-        return
-    project_name = project.get('name', 'Unknown Project')
+    Only issues updated after the scope's watermark are fetched (two days
+    on the first run), and notes are fetched for just those issues.
+    ``fetch_changed`` must raise on failure: the watermark then stays put
+    and the standup is rendered from what the store already has. On
+    success it advances to the newest updated_at actually received, but
+    never past an issue whose notes failed to load.
+    """
+    watermark = parse_gitlab_date(store.watermark(scope) or "")
+    since = watermark - WATERMARK_OVERLAP if watermark else now - timedelta(days=2)
 
-    members = fetch_project_members(headers, project_id)
+    try:
+        changed = fetch_changed(since.isoformat())
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ Failed to fetch changed issues, using the stored ones: {e}")
+        changed = None
+
+    if changed is not None:
+        notes = fetch_notes_bulk(headers, changed)
+        store.upsert(scope, changed, notes)
+        print(f"🔄 {len(changed)} issue(s) changed since {gitlab_timestamp(since)}")
+
+        received = [parse_gitlab_date(issue.get("updated_at") or "") for issue in changed]
+        received = [updated_at for updated_at in received if updated_at]
+        missing_notes = [
+            parse_gitlab_date(issue.get("updated_at") or "")
+            for issue in changed
+            if issue["id"] not in notes
+        ]
+        missing_notes = [updated_at for updated_at in missing_notes if updated_at]
+        if missing_notes:
+            # Stop before the first incomplete issue so the next run fetches it again
+            store.set_watermark(scope, gitlab_timestamp(min(missing_notes)))
+        elif received:
+            store.set_watermark(scope, gitlab_timestamp(max(received)))
+
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday = today - timedelta(days=1)
+    store.prune(scope, gitlab_timestamp(yesterday - timedelta(days=1)))
+    return store.issues(scope, gitlab_timestamp(yesterday))
+
+def build_standup(members, issues, headers, now, project_name_for, notes=None):
+    """Categorize each member's issues into yesterday/today/blockers.
+
+    ``project_name_for`` maps an issue to the project name shown with it,
+    so the same code serves a single project and a whole group. Notes are
+    fetched unless already given (keyed by issue id).
+    """
     final = {}
 
-    for member in members:
-        uid = member['id']
-        uname = member['username']
-        name = member['name']
-        final[name] = {"yesterday": [], "today": [], "blockers": []}
-
-        seen = set()
-        issues = fetch_issues(headers, project_id, uid, since)
-        for issue in issues:
-            seen.add(issue['id'])
+    # One fetch for the window; members are categorized from in-memory indexes
+    index = IssueIndex(issues)
+    enriched = {}
 
-        for issue in fetch_issues_by_username(headers, project_id, uname, since):
-            if issue['id'] not in seen:
-                issues.append(issue)
-                seen.add(issue['id'])
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday = today - timedelta(days=1)
 
-        for issue in fetch_authored_issues(headers, project_id, uid, since):
-            if issue['id'] not in seen:
-                issues.append(issue)
-                seen.add(issue['id'])
+    # Only issues updated since the start of yesterday are reported, so only they need notes
+    if notes is None:
+        notes = fetch_notes_bulk(headers, [
+            issue for issue in index.issues.values()
+            if (parse_gitlab_date(issue.get("updated_at")) or yesterday) >= yesterday
+        ])
 
-        for issue in fetch_all_project_issues(headers, project_id, since):
-            if issue['id'] in seen:
-                continue
-            title = (issue.get("title") or '').lower()
-            desc = (issue.get("description") or '').lower()
-            if name.lower() in title or name.lower() in desc:
-                issues.append(issue)
+    for member in members:
+        name = member['name']
+        final[name] = {"yesterday": [], "today": [], "blockers": []}
 
-        for issue in issues:
+        for issue in index.issues_for_member(member):
             updated_at = parse_gitlab_date(issue.get("updated_at"))
             if not updated_at:
                 continue
-            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            yesterday = today - timedelta(days=1)
 
             category = None
             if updated_at >= today:
@@ -139,19 +180,90 @@ def main(project_id):
             labels = [lbl.lower() for lbl in issue.get("labels", [])]
             is_blocker = any(l in ["blocked", "blocker", "impediment"] for l in labels)
 
-            enriched_issue = enrich_issue(issue, project_name, headers)
+            if issue['id'] not in enriched:
+                enriched[issue['id']] = enrich_issue(issue, project_name_for(issue), headers, notes.get(issue['id']))
+            enriched_issue = enriched[issue['id']]
 
             if is_blocker:
                 final[name]["blockers"].append(enriched_issue)
             else:
                 final[name][category].append(enriched_issue)
 
-    html = generate_summary(final)
+    return final
+
+def send_digests(final, members, heading, recipients_path):
+    """Send each recipient only their interns' summaries, all over one SMTP connection"""
+    recipients = load_recipients(recipients_path)
+    subject = f"Daily Standup Summary - {datetime.now().strftime('%Y-%m-%d')}"
+    digests = render_digests(final, members, recipients, heading)
+    messages = [build_message(SENDER_EMAIL, email, subject, html) for email, html in digests]
+
+    with DigestMailer(SMTP_SERVER, SMTP_PORT, SENDER_EMAIL, SENDER_PASSWORD, starttls=SMTP_STARTTLS) as mailer:
+        failures = mailer.send_all(messages)
+
+    print(f"✅ Sent {len(messages) - len(failures)} of {len(messages)} digest(s)")
+    for email, error in failures.items():
+        print(f"❌ {email}: {error}")
+
+def deliver(final, members, heading, digest=None):
+    # Rows go straight to disk as they are rendered; the page is never built in memory
+    with open(SUMMARY_PATH, "w", encoding="utf-8") as f:
+        render_summary(final, f, heading)
+
+    if digest:
+        send_digests(final, members, heading, digest)
+    else:
+        # MIMEText needs the whole body, so only the single-email path reads it back
+        with open(SUMMARY_PATH, encoding="utf-8") as f:
+            send_email(f.read())
+
+def main(project_id, digest=None):
+    headers = {"PRIVATE-TOKEN": GITLAB_TOKEN}
+
+    now = datetime.now(timezone.utc)
+
+    project = fetch_project_info(headers, project_id)
+    if not project:
+        print("Invalid project ID")
+        return
+    project_name = project.get('name', 'Unknown Project')
+
+    members = fetch_project_members(headers, project_id)
+    with IssueStore() as store:
+        issues = sync_issues(
+            store, f"project:{project_id}",
+            lambda since: fetch_all_project_issues(headers, project_id, since, strict=True),
+            headers, now
+        )
+    notes = {issue['id']: issue['notes'] for issue in issues}
+    final = build_standup(members, issues, headers, now, lambda issue: project_name, notes)
+
+    deliver(final, members, f"Project: {project_name}", digest)
+
+def main_group(group_id, digest=None):
+    """Combined standup for every project in a group from one paginated /groups/:id/issues stream"""
+    headers = {"PRIVATE-TOKEN": GITLAB_TOKEN}
+
+    now = datetime.now(timezone.utc)
+
+    group = fetch_group_info(headers, group_id)
+    if not group:
+        print("Invalid group ID")
+        return
+    group_name = group.get('full_name') or group.get('name', 'Unknown Group')
 
-    with open("standup_summary.html", "w", encoding="utf-8") as f:
-        f.write(html)
+    members = fetch_group_members(headers, group_id)
+    with IssueStore() as store:
+        issues = sync_issues(
+            store, f"group:{group_id}",
+            lambda since: fetch_group_issues(headers, group_id, since, strict=True),
+            headers, now
+        )
+    print(f"📥 {len(issues)} issue(s) updated across {len({issue['project_id'] for issue in issues})} project(s)")
+    notes = {issue['id']: issue['notes'] for issue in issues}
+    final = build_standup(members, issues, headers, now, issue_project_path, notes)
 
-    send_email(html)
+    deliver(final, members, f"Group: {group_name}", digest)
 
 def send_email(html_summary):
     try:
@@ -171,8 +283,18 @@ def send_email(html_summary):
         print(f"❌ Failed to send email: {e}")
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python backend_main.py <project_id>")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Daily standup summary from GitLab issues")
+    parser.add_argument("project_id", nargs="?", type=int, help="project to summarize")
+    parser.add_argument("--group", help="summarize every project in this group instead")
+    parser.add_argument("--digest", metavar="RECIPIENTS_JSON",
+                        help="send per-recipient digests ({email: [usernames]}) instead of one summary")
+    args = parser.parse_args()
+
+    if args.group:
+        main_group(args.group, args.digest)
+    elif args.project_id is not None:
+        main(args.project_id, args.digest)
     else:
-        main(int(sys.argv[1]))
\ No newline at end of file
+        parser.print_usage()
@@ -1,6 +1,11 @@
-from utils.fetch import fetch_paginated_data, make_api_request
+from utils.fetch import fetch_all_pages, fetch_paginated_data, make_api_request, SESSION
 from utils.auth import get_gitlab_headers
-from datetime import datetime, timedelta
+from utils.metrics import record_request
+from utils.cache import PersistentCache
+from utils.commit_classifier import classify, label_for, summarize_batch
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
 from urllib.parse import quote
 import streamlit as st
 import os
@@ -10,8 +15,25 @@ import json
 
 GITLAB_BASE_URL = "https://code.swecha.org/api/v4"
 
-def get_projects(group_id_or_path):
-    """Get all projects in a group with comprehensive error handling"""
+# Full member/project listings, revalidated with a one-item probe before reuse
+COLLECTION_SNAPSHOTS = PersistentCache("collection_snapshots")
+SNAPSHOT_MAX_AGE = 6 * 3600
+
+# Default-branch commits bucketed by UTC day, one cache file per project.
+# A day that has ended never changes, so its bucket is kept for good and
+# only today is ever refetched.
+COMMIT_DAY_CACHES = {}
+_COMMIT_DAY_LOCK = threading.Lock()
+
+def get_projects(group_id_or_path, strict=False):
+    """Get all projects in a group with comprehensive error handling.
+
+    With ``strict`` an unknown group or a failed page raises instead of
+    being reported and turned into an empty or partial list.
+    """
+    if strict:
+        projects_url = f"{GITLAB_BASE_URL}/groups/{quote(str(group_id_or_path), safe='')}/projects"
+        return fetch_all_pages(projects_url, get_gitlab_headers(), {'membership': 'true'})
     try:
         headers = get_gitlab_headers()
         encoded_group = quote(str(group_id_or_path), safe='')
@@ -38,31 +60,96 @@ def get_projects(group_id_or_path):
         st.error(f"🚨 Error fetching projects: {str(e)}")
         return []
 
-def get_commits_for_project(project_id, since_date):
-    """Get commits for a specific project"""
+def commit_day_cache(project_id):
+    with _COMMIT_DAY_LOCK:
+        if project_id not in COMMIT_DAY_CACHES:
+            COMMIT_DAY_CACHES[project_id] = PersistentCache(f"commit_days_{project_id}")
+        return COMMIT_DAY_CACHES[project_id]
+
+def commit_time(commit):
+    """Committed date as an aware UTC datetime (what GitLab's `since` filters on)"""
+    stamp = commit.get('committed_date') or commit['created_at']
+    return datetime.fromisoformat(stamp.replace('Z', '+00:00')).astimezone(timezone.utc)
+
+def fetch_commits_since(project_id, since, headers):
+    """Every default-branch commit since `since`, or None if any page failed"""
     url = f"{GITLAB_BASE_URL}/projects/{project_id}/repository/commits"
-    params = {
-        'since': since_date.isoformat(),
-        'per_page': 100  # Get maximum allowed per request
-    }
-    return fetch_paginated_data(url, get_gitlab_headers(), params)
+    commits = []
+    page = 1
+    while True:
+        result = safe_api_request(url, headers, {'since': since.isoformat(), 'per_page': 100, 'page': page})
+        if not result["success"]:
+            return None
+        commits.extend(result["data"])
+        if len(result["data"]) < 100:
+            return commits
+        page += 1
+
+def get_commits_for_project(project_id, since_date, headers=None, use_cache=True, strict=False):
+    """Get commits for a specific project.
+
+    Commits come from per-day buckets: finished UTC days are served from
+    the cache and only the days not cached yet (normally just today) are
+    requested, in one paginated call. Pass ``headers`` when calling from
+    worker threads, which cannot read the Streamlit session the default
+    headers come from. With ``strict`` a failed fetch raises instead of
+    returning no commits.
+    """
+    headers = headers or get_gitlab_headers()
+    if not use_cache:
+        url = f"{GITLAB_BASE_URL}/projects/{project_id}/repository/commits"
+        params = {
+            'since': since_date.isoformat(),
+            'per_page': 100  # Get maximum allowed per request
+        }
+        fetch = fetch_all_pages if strict else fetch_paginated_data
+        return fetch(url, headers, params)
+
+    since = since_date.astimezone(timezone.utc)
+    today = datetime.now(timezone.utc).date()
+    if since.date() > today:
+        return []
+    days = [since.date() + timedelta(days=offset) for offset in range((today - since.date()).days + 1)]
+
+    cache = commit_day_cache(project_id)
+    buckets = {}
+    for day in days[:-1]:
+        cached = cache.get(day.isoformat())
+        if cached is None:
+            break
+        buckets[day] = cached
+
+    # Everything from the first uncached day onwards comes from one request
+    first_missing = days[len(buckets)]
+    fetch_from = datetime.combine(first_missing, datetime.min.time(), tzinfo=timezone.utc)
+    fresh = fetch_commits_since(project_id, fetch_from, headers)
+    if fresh is None:
+        if strict:
+            raise RuntimeError(f"Could not fetch commits of project {project_id}")
+        return []
+
+    fetched = {day: [] for day in days[len(buckets):]}
+    for commit in fresh:
+        fetched.setdefault(commit_time(commit).date(), []).append(commit)
+    for day, day_commits in fetched.items():
+        if day < today:
+            cache.set(day.isoformat(), day_commits)
+    buckets.update(fetched)
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"⚠️ Could not persist commit cache: {e}")
+
+    return [
+        commit
+        for day in sorted(buckets, reverse=True)
+        for commit in buckets[day]
+        if commit_time(commit) >= since
+    ]
 
 def summarize_commit(message):
     """Create user-friendly commit summaries"""
-    message = message.lower()
-    if any(word in message for word in ['fix', 'bug', 'error']):
-        return "🛠️ Bug fix"
-    elif any(word in message for word in ['add', 'create', 'new']):
-        return "➕ New feature"
-    elif any(word in message for word in ['update', 'upgrade', 'improve']):
-        return "🔄 Update"
-    elif any(word in message for word in ['remove', 'delete', 'clean']):
-        return "❌ Removal"
-    elif 'refactor' in message:
-        return "♻️ Code refactor"
-    elif 'merge' in message:
-        return "🔀 Merge"
-    return "📝 " + message.capitalize()
+    return label_for(message, classify(message))
 
 
 def run_commits():
@@ -97,8 +184,8 @@ def run_commits():
             print("ℹ️ No commits found.")
             continue
 
-        for commit in commits[:5]:  # show only first 5 per project
-            summary = summarize_commit(commit['title'])
+        shown = commits[:5]  # show only first 5 per project
+        for commit, summary in zip(shown, summarize_batch([commit['title'] for commit in shown])):
             print(f"✅ {commit['title']} by {commit['author_name']} on {commit['created_at'][:10]} - {summary}")
 
 
@@ -133,7 +220,7 @@ def get_gitlab_headers(debug_mode=False):  # noqa: F811
     
     return {"PRIVATE-TOKEN": token, "Content-Type": "application/json"}
 
-def safe_api_request(url, headers, params=None, timeout=30, retries=3,debug_mode=False):
+def safe_api_request(url, headers, params=None, timeout=30, retries=3,debug_mode=False, return_headers=False):
     """Make API request with enhanced error handling and retry logic"""
     for attempt in range(retries):
         try:
@@ -145,7 +232,8 @@ def safe_api_request(url, headers, params=None, timeout=30, retries=3,debug_mode
             # Rate limiting
             time.sleep(0.1)
             
-            response = requests.get(url, headers=headers, params=params, timeout=timeout)
+            response = SESSION.get(url, headers=headers, params=params, timeout=timeout)
+            record_request(len(response.content), retry=attempt > 0, error=response.status_code != 200)
             
             if debug_mode and attempt == 0:
                 st.write(f"📊 Response Status: {response.status_code}")
@@ -155,6 +243,8 @@ def safe_api_request(url, headers, params=None, timeout=30, retries=3,debug_mode
                     data = response.json()
                     if debug_mode and isinstance(data, list) and attempt == 0:
                         st.write(f"📝 Returned {len(data)} items")
+                    if return_headers:
+                        return {"success": True, "data": data, "headers": dict(response.headers)}
                     return {"success": True, "data": data}
                 except json.JSONDecodeError:
                     return {"success": False, "error": "Invalid JSON response"}
@@ -178,10 +268,12 @@ def safe_api_request(url, headers, params=None, timeout=30, retries=3,debug_mode
                 continue
                 
         except requests.exceptions.Timeout:
+            record_request(retry=attempt > 0, error=True)
             if attempt == retries - 1:
                 return {"success": False, "error": "Request timeout"}
             time.sleep(2)
         except requests.exceptions.ConnectionError:
+            record_request(retry=attempt > 0, error=True)
             if attempt == retries - 1:
                 return {"success": False, "error": "Connection error"}
             time.sleep(2)
@@ -190,4 +282,57 @@ def safe_api_request(url, headers, params=None, timeout=30, retries=3,debug_mode
                 return {"success": False, "error": f"Request failed: {str(e)}"}
             time.sleep(1)
     
-    return {"success": False, "error": "Max retries exceeded"}
\ No newline at end of file
+    return {"success": False, "error": "Max retries exceeded"}
+
+
+def probe_collection(url, headers, params=None, identity_fields=("id",)):
+    """Fetch one item of a paginated collection to fingerprint it cheaply.
+
+    The fingerprint is X-Total plus the identity fields of the first item
+    (for collections ordered newest first, the newest item). Returns None
+    when GitLab does not report X-Total, so callers fall back to a full fetch.
+    """
+    probe_params = dict(params or {})
+    probe_params.update({"per_page": 1, "page": 1})
+    result = safe_api_request(url, headers, probe_params, return_headers=True)
+    if not result["success"]:
+        return None
+
+    total = result["headers"].get("X-Total")
+    if total is None:
+        return None
+    items = result["data"] or []
+    head = [items[0].get(field) for field in identity_fields] if items else []
+    return [int(total)] + head
+
+
+def snapshot_key(kind, scope, headers):
+    """Cache key for a collection snapshot; includes a token digest since visibility is per token"""
+    token = (headers or {}).get("PRIVATE-TOKEN") or ""
+    return f"{kind}:{scope}:{hashlib.sha256(token.encode()).hexdigest()[:12]}"
+
+
+def get_collection_snapshot(key, url, headers, params=None, identity_fields=("id",)):
+    """Return the cached listing for key if a per_page=1 probe shows nothing changed, else None"""
+    cached = COLLECTION_SNAPSHOTS.get(key)
+    if cached is None:
+        return None
+
+    fingerprint = probe_collection(url, headers, params, identity_fields)
+    if fingerprint is not None and fingerprint == cached["fingerprint"]:
+        return cached["data"]
+    return None
+
+
+def store_collection_snapshot(key, data, identity_fields=("id",)):
+    """Remember a complete listing; its fingerprint is derived from the data itself.
+
+    The first item of a full fetch is the same item a per_page=1 probe with
+    the same ordering returns, and the item count equals X-Total.
+    """
+    head = [data[0].get(field) for field in identity_fields] if data else []
+    COLLECTION_SNAPSHOTS.set(key, {"fingerprint": [len(data)] + head, "data": data}, ttl=SNAPSHOT_MAX_AGE)
+    try:
+        COLLECTION_SNAPSHOTS.save()
+    except OSError:
+        pass
@@ -1,9 +1,13 @@
 # apis/groups_api.py
 from turtle import st
-from utils.fetch import make_api_request
+from utils.fetch import make_api_request, make_api_write
 from utils.auth import get_gitlab_headers
+from utils.cache import PersistentCache
+from utils.metrics import in_current_run
+from utils.ratelimit import RateLimiter
 from urllib.parse import quote  # noqa: F401
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from apis.users_api import get_user_id
 from apis.commits_api import safe_api_request
 
@@ -11,6 +15,13 @@ from apis.commits_api import safe_api_request
 
 GITLAB_URL = "https://code.swecha.org"
 
+# Username -> user id never changes for an account, so resolutions are kept for a month
+USER_ID_CACHE = PersistentCache("user_ids")
+USER_ID_TTL = 30 * 24 * 3600
+
+BULK_WORKERS = 8
+BULK_WRITES_PER_SECOND = 10
+
 def get_all_users_from_group(group_id):
     all_members = []
     page = 1
@@ -26,33 +37,96 @@ def get_all_users_from_group(group_id):
         page += 1
     return all_members
 
+def read_usernames(lines):
+    """Usernames from CSV lines with a `username` column, blanks and duplicates dropped"""
+    usernames = (row.get("username", "").strip() for row in csv.DictReader(lines))
+    return list(dict.fromkeys(username for username in usernames if username))
+
+
+def resolve_user_ids(usernames, max_workers=BULK_WORKERS):
+    """Resolve usernames to user ids concurrently, reusing cached resolutions"""
+    resolved = {}
+    missing = []
+    for username in usernames:
+        user_id = USER_ID_CACHE.get(username.lower())
+        if user_id is not None:
+            resolved[username] = user_id
+        else:
+            missing.append(username)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            lookup = in_current_run(get_user_id)
+            futures = {executor.submit(lookup, username): username for username in missing}
+            for future in as_completed(futures):
+                username = futures[future]
+                try:
+                    user_id = future.result()
+                except Exception:
+                    user_id = None
+                resolved[username] = user_id
+                if user_id is not None:
+                    USER_ID_CACHE.set(username.lower(), user_id, ttl=USER_ID_TTL)
+        try:
+            USER_ID_CACHE.save()
+        except OSError:
+            pass
+
+    return resolved
+
+
+def bulk_manage_members(group_id, usernames, access_level, action="add",
+                        max_workers=BULK_WORKERS, writes_per_second=BULK_WRITES_PER_SECOND):
+    """Add members to a group (action="add") or change their access level (action="update").
+
+    Usernames are resolved concurrently, then the POST/PUT writes go through
+    a rate-limited worker pool. Returns one result dict per username, in
+    input order: {"username", "user_id", "status", "detail"}.
+    """
+    headers = get_gitlab_headers()
+    user_ids = resolve_user_ids(usernames, max_workers)
+    limiter = RateLimiter(writes_per_second)
+
+    def write(username):
+        user_id = user_ids.get(username)
+        if not user_id:
+            return {"username": username, "user_id": None, "status": "not_found", "detail": "User not found"}
+
+        limiter.acquire()
+        if action == "add":
+            url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members"
+            result = make_api_write("POST", url, headers, {"user_id": user_id, "access_level": access_level})
+        else:
+            url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members/{user_id}"
+            result = make_api_write("PUT", url, headers, {"access_level": access_level})
+
+        if result["success"]:
+            status = "added" if action == "add" else "updated"
+            return {"username": username, "user_id": user_id, "status": status, "detail": f"access_level={access_level}"}
+        if action == "add" and result["status"] == 409:
+            return {"username": username, "user_id": user_id, "status": "already_member", "detail": result["error"]}
+        return {"username": username, "user_id": user_id, "status": "failed", "detail": result["error"]}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(in_current_run(write), usernames))
+
+
+BULK_STATUS_ICONS = {
+    "added": "✅", "updated": "🔄", "already_member": "ℹ️", "not_found": "❌", "failed": "🚨",
+}
+
+
 def add_members_to_group(group_id, filename, access_level=30):
     with open(filename, newline="") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            username = row["username"].strip()
-            user_id = get_user_id(username)
-            if not user_id:
-                continue
-            url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members"
-            data = {"user_id": user_id, "access_level": access_level}
-            response = make_api_request(url, get_gitlab_headers(), data=data)
-            if response:
-                print(f"✅ Added '{username}' to the group.")
+        usernames = read_usernames(csvfile)
+    for result in bulk_manage_members(group_id, usernames, access_level, action="add"):
+        print(f"{BULK_STATUS_ICONS[result['status']]} {result['username']}: {result['status']} ({result['detail']})")
 
 def update_access_level(group_id, filename, level):
     with open(filename, newline="") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            username = row["username"].strip()
-            user_id = get_user_id(username)
-            if not user_id:
-                continue
-            url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members/{user_id}"
-            data = {"access_level": level}
-            response = make_api_request(url, get_gitlab_headers(), data=data)
-            if response:
-                print(f"🔄 Updated access level for '{username}'")
+        usernames = read_usernames(csvfile)
+    for result in bulk_manage_members(group_id, usernames, level, action="update"):
+        print(f"{BULK_STATUS_ICONS[result['status']]} {result['username']}: {result['status']} ({result['detail']})")
 
 def run_groups():
     print("\n👥 Manage GitLab Groups")
@@ -86,7 +160,12 @@ def run_groups():
 
 # @st.cache_data(ttl=300)  # Cache for 5 minutes
 def get_group_members(group_id,debug_mode = False):
-    """Fetch all members from a GitLab group with improved error handling"""
+    """Fetch all members from a GitLab group with improved error handling.
+
+    Always a full listing: /members/all has no stable ordering or change
+    timestamp, so a cheap probe cannot tell when a member was swapped or
+    their access level or expiry changed.
+    """
     headers = get_gitlab_headers()
     if not headers:
         return {"success": False, "error": "No valid GitLab token found"}
@@ -94,15 +173,16 @@ def get_group_members(group_id,debug_mode = False):
     if debug_mode:
         st.write(f"🔍 Fetching members for group ID: {group_id}")  
     
+    members_url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members/all"
+    
     members = []
     page = 1
     per_page = 100
     
     while True:
-        url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members/all"
         params = {"page": page, "per_page": per_page}
         
-        result = safe_api_request(url, headers, params)
+        result = safe_api_request(members_url, headers, params)
         
         if not result["success"]:
             return result
@@ -130,4 +210,46 @@ def get_group_members(group_id,debug_mode = False):
     if debug_mode:
         st.write(f"✅ Total members loaded: {len(members)}")
     
-    return {"success": True, "data": members}
\ No newline at end of file
+    return {"success": True, "data": members}
+
+
+def get_members_for_groups(group_ids, debug_mode=False, max_workers=4):
+    """Load members of several groups concurrently and deduplicate them by user id.
+
+    Returns the unique members plus, per group, the set of member ids so a
+    single activity crawl can be broken down by cohort afterwards.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(group_ids)))) as executor:
+        fetch = in_current_run(get_group_members)
+        futures = {executor.submit(fetch, gid, debug_mode): gid for gid in group_ids}
+        for future in as_completed(futures):
+            gid = futures[future]
+            try:
+                results[gid] = future.result()
+            except Exception as e:
+                results[gid] = {"success": False, "error": str(e)}
+
+    members_by_id = {}
+    group_member_ids = {}
+    errors = {}
+    for gid in group_ids:
+        result = results[gid]
+        if not result["success"]:
+            errors[gid] = result["error"]
+            continue
+        member_ids = set()
+        for member in result["data"]:
+            members_by_id.setdefault(member["id"], member)
+            member_ids.add(member["id"])
+        group_member_ids[gid] = member_ids
+
+    if not group_member_ids:
+        return {"success": False, "error": "; ".join(f"{gid}: {err}" for gid, err in errors.items()), "errors": errors}
+
+    return {
+        "success": True,
+        "data": list(members_by_id.values()),
+        "groups": group_member_ids,
+        "errors": errors
+    }
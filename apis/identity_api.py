@@ -0,0 +1,147 @@
+# apis/identity_api.py
+import re
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+from apis.users_api import fetch_user_details_bulk
+
+GITLAB_URL = "https://code.swecha.org"
+NOREPLY_DOMAIN = f"users.noreply.{urlparse(GITLAB_URL).hostname}"
+
+_AMBIGUOUS = object()
+
+
+def normalize_identity(value):
+    """Case- and punctuation-insensitive form of a name or username"""
+    if not value:
+        return ""
+    return re.sub(r"[\W_]+", "", str(value).casefold())
+
+
+def normalize_email(value):
+    return (value or "").strip().casefold()
+
+
+class IdentityIndex:
+    """Maps every known identity of a member (user id, username, display name,
+    aliases, commit emails) to that member's user id.
+
+    Built once before the activity scan, then every commit, MR, issue or
+    event author resolves with a single dict lookup. Keys claimed by two
+    different members are marked ambiguous and never resolve, so activity is
+    not silently given to the wrong person.
+    """
+
+    def __init__(self):
+        self.members = {}
+        self._ids = set()
+        self._keys = {}
+        self._lock = threading.Lock()
+        self.unresolved = Counter()
+
+    def _claim(self, kind, value, member_id):
+        if not value:
+            return
+        key = (kind, value)
+        current = self._keys.get(key)
+        if current is None:
+            self._keys[key] = member_id
+        elif current != member_id:
+            self._keys[key] = _AMBIGUOUS
+
+    def add_member(self, member):
+        member_id = member["id"]
+        self.members[member_id] = member
+        self._ids.add(member_id)
+        self._claim("name", normalize_identity(member.get("username")), member_id)
+        self._claim("name", normalize_identity(member.get("name")), member_id)
+        self._claim("email", normalize_email(f"{member_id}-{member.get('username')}@{NOREPLY_DOMAIN}"), member_id)
+
+    def add_alias(self, alias, member_id):
+        self._claim("name", normalize_identity(alias), member_id)
+
+    def add_email(self, email, member_id):
+        self._claim("email", normalize_email(email), member_id)
+
+    def add_user_details(self, details):
+        """Harvest extra identities from a /users/:id payload"""
+        member_id = details.get("id")
+        if member_id not in self._ids:
+            return
+        for field in ("public_email", "email", "commit_email"):
+            self.add_email(details.get(field), member_id)
+        self._claim("name", normalize_identity(details.get("name")), member_id)
+
+    def _lookup(self, kind, value):
+        member_id = self._keys.get((kind, value))
+        return None if member_id is _AMBIGUOUS else member_id
+
+    def resolve_commit(self, commit):
+        """Member id for a commit, by author email first, then author name"""
+        email = normalize_email(commit.get("author_email"))
+        member_id = self._lookup("email", email)
+        if member_id is not None:
+            return member_id
+
+        name = commit.get("author_name")
+        member_id = self._lookup("name", normalize_identity(name))
+        if member_id is not None:
+            # Remember the email so later commits with a different spelling still match
+            if email:
+                with self._lock:
+                    self._keys.setdefault(("email", email), member_id)
+            return member_id
+
+        with self._lock:
+            self.unresolved[(name or "Unknown", email)] += 1
+        return None
+
+    def resolve_user(self, user):
+        """Member id for an API user object (MR/issue/event author)"""
+        if not user:
+            return None
+        if user.get("id") in self._ids:
+            return user["id"]
+        return (
+            self._lookup("name", normalize_identity(user.get("username")))
+            or self._lookup("name", normalize_identity(user.get("name")))
+        )
+
+    def __contains__(self, member_id):
+        return member_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def identities(self):
+        """(identity, member username) pairs for debugging"""
+        rows = []
+        for (kind, value), member_id in sorted(self._keys.items(), key=lambda item: item[0]):
+            username = "⚠️ ambiguous" if member_id is _AMBIGUOUS else self.members[member_id].get("username")
+            rows.append({"Kind": kind, "Identity": value, "Member": username})
+        return rows
+
+
+def build_identity_index(members, aliases=None, lookup_users=True, debug_mode=False):
+    """Build an IdentityIndex from group members.
+
+    ``aliases`` maps extra names (e.g. commit author names) to member
+    usernames. With ``lookup_users`` the members' /users/:id records are
+    fetched (cached) to learn their public commit emails.
+    """
+    index = IdentityIndex()
+    for member in members:
+        index.add_member(member)
+
+    by_username = {normalize_identity(member["username"]): member["id"] for member in members}
+    for alias, username in (aliases or {}).items():
+        member_id = by_username.get(normalize_identity(username))
+        if member_id is not None:
+            index.add_alias(alias, member_id)
+
+    if lookup_users:
+        for details in fetch_user_details_bulk([member["id"] for member in members], debug_mode=debug_mode).values():
+            index.add_user_details(details)
+
+    return index
@@ -1,11 +1,19 @@
 # apis/issues_api.py
-from utils.fetch import make_api_request
+from utils.fetch import make_api_request, fetch_paginated_data, fetch_all_pages
+from utils.cache import PersistentCache
+from utils.metrics import in_current_run
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import os
 import requests
 
 GITLAB_URL = "https://code.swecha.org/api/v4"
 
+# An issue's notes can only change when its updated_at does, so (id, updated_at) keys never go stale
+NOTES_CACHE = PersistentCache("issue_notes")
+NOTES_TTL = 14 * 24 * 3600
+NOTES_WORKERS = 8
+
 
 
 def fetch_project_info(headers, project_id):
@@ -34,7 +42,7 @@ def fetch_issues(headers, project_id, user_id, since):
 
 def fetch_project_members(headers, project_id):
     url_base = f"{GITLAB_URL}/projects/{project_id}/members/all"
-    return make_api_request(url_base, headers)
+    return fetch_paginated_data(url_base, headers)
 
 def fetch_issues_by_assignee(headers, project_id, user_id, since):
     url_base = f"{GITLAB_URL}/projects/{project_id}/issues"
@@ -66,18 +74,95 @@ def fetch_authored_issues(headers, project_id, user_id, since):
     }
     return make_api_request(url_base, headers, params=extra_params)
 
-def fetch_all_project_issues(headers, project_id, since):
+def fetch_all_project_issues(headers, project_id, since, strict=False):
+    """All issues (any state) updated since `since`, across every page.
+
+    With ``strict`` a failed page raises instead of cutting the list short.
+    """
     url_base = f"{GITLAB_URL}/projects/{project_id}/issues"
     extra_params = {
         "updated_after": since,
         "state": "all",
-        "per_page": 100
     }
-    return make_api_request(url_base, headers, params=extra_params)
+    fetch = fetch_all_pages if strict else fetch_paginated_data
+    return fetch(url_base, headers, extra_params)
+
+def fetch_group_info(headers, group_id):
+    url = f"{GITLAB_URL}/groups/{group_id}"
+    return make_api_request(url, headers)
+
+def fetch_group_members(headers, group_id):
+    url_base = f"{GITLAB_URL}/groups/{group_id}/members/all"
+    return fetch_paginated_data(url_base, headers)
+
+def fetch_group_issues(headers, group_id, since, strict=False):
+    """All issues (any state) updated since `since` in every project of a group and its subgroups.
+
+    With ``strict`` a failed page raises instead of cutting the list short.
+    """
+    url_base = f"{GITLAB_URL}/groups/{group_id}/issues"
+    extra_params = {
+        "updated_after": since,
+        "state": "all",
+        "scope": "all",
+        "include_subgroups": "true",
+    }
+    fetch = fetch_all_pages if strict else fetch_paginated_data
+    return fetch(url_base, headers, extra_params)
+
+def issue_project_path(issue):
+    """Project path of an issue from its references (e.g. 'group/project#12'), without extra requests"""
+    full_ref = (issue.get("references") or {}).get("full") or ""
+    return full_ref.rsplit("#", 1)[0] or str(issue.get("project_id", "Unknown Project"))
 
 def fetch_notes(headers, project_id, issue_iid):
+    """Every note of an issue; raises requests.RequestException rather than returning a partial list"""
     url = f"{GITLAB_URL}/projects/{project_id}/issues/{issue_iid}/notes"
-    return make_api_request(url, headers)
+    return fetch_all_pages(url, headers)
+
+def fetch_notes_bulk(headers, issues, max_workers=NOTES_WORKERS):
+    """Notes for many issues, keyed by issue id.
+
+    Issues without user notes are skipped, cached notes are reused while the
+    issue's updated_at is unchanged, and the rest are fetched concurrently.
+    Only complete fetches are cached; issues whose notes failed to load are
+    left out of the result, so callers can tell them apart from issues that
+    really have no notes.
+    """
+    notes = {}
+    pending = {}
+    for issue in issues:
+        if issue.get("user_notes_count") == 0:
+            notes[issue["id"]] = []
+            continue
+        key = f"{issue['id']}:{issue.get('updated_at')}"
+        cached = NOTES_CACHE.get(key)
+        if cached is not None:
+            notes[issue["id"]] = cached
+        else:
+            pending[key] = issue
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(in_current_run(fetch_notes), headers, issue["project_id"], issue["iid"]): key
+                for key, issue in pending.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    issue_notes = future.result()
+                except Exception as e:
+                    print(f"⚠️ Failed to fetch notes for issue {pending[key]['iid']}: {e}")
+                    continue
+                notes[pending[key]["id"]] = issue_notes
+                NOTES_CACHE.set(key, issue_notes, ttl=NOTES_TTL)
+        try:
+            NOTES_CACHE.save()
+        except OSError as e:
+            print(f"⚠️ Could not persist notes cache: {e}")
+
+    return notes
 
 def run_issues():
     print("\n📊 Fetching GitLab Issues...")
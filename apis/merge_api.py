@@ -1,14 +1,17 @@
 # apis/merge_api.py
-from utils.fetch import make_api_request
+from utils.fetch import fetch_all_pages, make_api_request
 from datetime import datetime
 import os
 
 GITLAB_URL = "https://code.swecha.org"
 
-def get_merge_requests(project_id):
+def get_merge_requests(project_id, strict=False):
+    """Open merge requests; with ``strict`` every page is read and a failure raises"""
     headers = {"PRIVATE-TOKEN": os.getenv("GITLAB_TOKEN")}
     url_base = f"{GITLAB_URL}/api/v4/projects/{project_id}/merge_requests"
     extra_params = {"state": "opened"}
+    if strict:
+        return fetch_all_pages(url_base, headers, extra_params)
     return make_api_request(url_base, headers, params=extra_params)
 
 def get_merge_request_changes(project_id, mr_iid):
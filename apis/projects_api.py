@@ -6,8 +6,10 @@ import os
 from utils.fetch import fetch_paginated_data
 from utils.auth import get_gitlab_headers
 from apis.commits_api import safe_api_request, get_gitlab_headers  # noqa: F811
+from apis.commits_api import snapshot_key, get_collection_snapshot, store_collection_snapshot
 from dateutil.parser import parse as parse_datetime
 from collections import defaultdict
+from utils.activity_series import new_daily_counts, record_day, series_length
 GITLAB_API_URL = "https://code.swecha.org/api/v4"
 GITLAB_URL = "https://code.swecha.org"
 
@@ -59,28 +61,36 @@ def run_check_file():
     else:
         print(f"❌ File '{file_path}' NOT FOUND in '{project_path}'.")
 
-def get_all_accessible_projects(debug_mode=False):
-    """Get all accessible projects for the user with improved error handling"""
+# Projects are listed most recently active first, so the head item's activity time changes with any push
+PROJECT_IDENTITY_FIELDS = ("id", "last_activity_at")
+
+
+def get_all_accessible_projects(debug_mode=False, use_snapshot=True):
+    """Get all accessible projects for the user with improved error handling.
+
+    With ``use_snapshot`` a one-project probe is compared against the last
+    full catalog, and the catalog is reused when nothing changed.
+    """
     headers = get_gitlab_headers()
     if not headers:
         return {"success": False, "error": "No valid GitLab token found"}
     
+    projects_url = f"{GITLAB_URL}/api/v4/projects"
+    list_params = {"membership": "true", "simple": "true", "order_by": "last_activity_at", "sort": "desc"}
+    key = snapshot_key("projects", "membership", headers)
+    if use_snapshot:
+        cached_projects = get_collection_snapshot(key, projects_url, headers, list_params, PROJECT_IDENTITY_FIELDS)
+        if cached_projects is not None:
+            return {"success": True, "data": cached_projects, "cached": True}
+    
     projects = []
     page = 1
     per_page = 100
     
     while True:
-        url = f"{GITLAB_URL}/api/v4/projects"
-        params = {
-            "membership": "true",
-            "simple": "true", 
-            "per_page": per_page,
-            "page": page,
-            "order_by": "last_activity_at",
-            "sort": "desc"
-        }
+        params = {**list_params, "per_page": per_page, "page": page}
         
-        result = safe_api_request(url, headers, params)
+        result = safe_api_request(projects_url, headers, params)
         
         if not result["success"]:
             return result
@@ -103,12 +113,22 @@ def get_all_accessible_projects(debug_mode=False):
             print("⚠️ Hit page limit for projects. Some projects might not be loaded.")
             break
     
+    if use_snapshot:
+        store_collection_snapshot(key, projects, PROJECT_IDENTITY_FIELDS)
+    
     return {"success": True, "data": projects}
 
 
 
-def get_project_activity(project_id, project_name, since_date, valid_names,debug_mode=False):
-    """Get all activity for a specific project"""
+def get_project_activity(project_id, project_name, since_date, identity_index,debug_mode=False, n_days=None, events=None):
+    """Get all activity for a specific project.
+
+    Authors are resolved to member ids through ``identity_index``
+    (see apis.identity_api), so the returned stats are keyed by member id.
+    If an ``events`` list is passed, one raw row per attributed commit, MR,
+    issue and push event is appended to it for export.
+    """
+    n_days = n_days or series_length(since_date)
     stats = defaultdict(lambda: {
     "commits": 0,
     "merge_requests": 0,
@@ -116,9 +136,34 @@ def get_project_activity(project_id, project_name, since_date, valid_names,debug
     
     "push_events": 0,
     "project_names": set(),
-    "last_activity": None
+    "last_activity": None,
+    "daily": new_daily_counts(n_days)
 })
 
+    def attribute(member_id, kind, timestamp, ref, title=""):
+        """Count one activity for a resolved member"""
+        user_stats = stats[member_id]
+        user_stats[kind] += 1
+        user_stats["project_names"].add(project_name)
+        if events is not None:
+            events.append({
+                "project_id": project_id,
+                "project": project_name,
+                "kind": kind,
+                "author": identity_index.members[member_id].get("username"),
+                "timestamp": timestamp,
+                "ref": ref,
+                "title": title
+            })
+        if timestamp:
+            try:
+                dt = parse_datetime(timestamp)
+                if not user_stats["last_activity"] or dt > user_stats["last_activity"]:
+                    user_stats["last_activity"] = dt
+                record_day(user_stats["daily"][kind], dt, since_date)
+            except Exception:
+                pass
+
 
 
     headers = get_gitlab_headers()
@@ -148,19 +193,9 @@ def get_project_activity(project_id, project_name, since_date, valid_names,debug
                 break
             
             for commit in commits:
-                author = commit.get("author_name", "Unknown")
-                if author in valid_names:
-                    stats[author]["commits"] += 1
-                    stats[author]["project_names"].add(project_name)
-                
-                created_at = commit.get("created_at")
-                if created_at:
-                    try:
-                        dt = parse_datetime(created_at)
-                        if not stats[author]["last_activity"] or dt > stats[author]["last_activity"]:
-                            stats[author]["last_activity"] = dt
-                    except Exception:
-                        pass
+                member_id = identity_index.resolve_commit(commit)
+                if member_id is not None:
+                    attribute(member_id, "commits", commit.get("created_at"), commit.get("short_id"), commit.get("title", ""))
         
         # Check if we've reached the last page
             if len(commits) < 100:  # Less than per_page means last page
@@ -188,20 +223,9 @@ def get_project_activity(project_id, project_name, since_date, valid_names,debug
                 break
             
             for mr in mrs:
-                author_info = mr.get("author", {})
-                author = author_info.get("name", "Unknown")
-                if author in valid_names:
-                    stats[author]["merge_requests"] += 1
-                    stats[author]["project_names"].add(project_name)
-                
-                updated_at = mr.get("updated_at")
-                if updated_at:
-                    try:
-                        dt = parse_datetime(updated_at)
-                        if not stats[author]["last_activity"] or dt > stats[author]["last_activity"]:
-                            stats[author]["last_activity"] = dt
-                    except Exception:
-                        pass
+                member_id = identity_index.resolve_user(mr.get("author"))
+                if member_id is not None:
+                    attribute(member_id, "merge_requests", mr.get("updated_at"), f"!{mr.get('iid')}", mr.get("title", ""))
         
         # Check if we've reached the last page
             if len(mrs) < 100:  # Less than per_page means last page
@@ -221,36 +245,16 @@ def get_project_activity(project_id, project_name, since_date, valid_names,debug
         if issues_result["success"]:
             issues = issues_result["data"]
             for issue in issues or []:
-                author_info = issue.get("author", {})
-                author = author_info.get("name", "Unknown")
-                if author in valid_names:
-                    stats[author]["issues"] += 1
-                    stats[author]["project_names"].add(project_name)
-                    
-                    created_at = issue.get("created_at")
-                    if created_at:
-                        try:
-                            dt = parse_datetime(created_at)
-                            if not stats[author]["last_activity"] or dt > stats[author]["last_activity"]:
-                                stats[author]["last_activity"] = dt
-                        except Exception:
-                            pass
+                member_id = identity_index.resolve_user(issue.get("author"))
+                if member_id is not None:
+                    attribute(member_id, "issues", issue.get("created_at"), f"#{issue.get('iid')}", issue.get("title", ""))
     
     except Exception as e:
         if debug_mode:
             st.write(f"Error processing issues for project {project_name}: {e}")
-    
-    except Exception as e:
-        if debug_mode:
-            st.write(f"Error processing project {project_name}: {e}")
-
 
-       
 
-
-        # 🔵 GET PUSH EVENTS
         # 🔵 GET PUSH EVENTS - using safe paginated format
-    # 🔵 GET PUSH EVENTS - Fixed
     try:
         events_url = f"{GITLAB_URL}/api/v4/projects/{project_id}/events"
         events_params = {
@@ -268,32 +272,21 @@ def get_project_activity(project_id, project_name, since_date, valid_names,debug
                     st.write(f"❌ Failed to fetch push events on page {page}")
                 break
 
-            events = events_result["data"]
-            if not events:
+            push_events = events_result["data"]
+            if not push_events:
                 break
 
-            for event in events:
-                author = event.get("author", {}).get("name", "Unknown")
-                commit_count = event.get("push_data", {}).get("commit_count", 0)
+            for event in push_events:
+                member_id = identity_index.resolve_user(event.get("author"))
+                push_data = event.get("push_data", {})
 
                 if debug_mode:
-                    st.write(f"Push event: author={author}, commits={commit_count}, in valid_names={author in valid_names}")
-
-
-                if author in valid_names:
-                    stats[author]["push_events"] += 1
-                    stats[author]["project_names"].add(project_name)
+                    st.write(f"Push event: author={event.get('author', {}).get('name', 'Unknown')}, commits={push_data.get('commit_count', 0)}, resolved={member_id is not None}")
 
-                    created_at = event.get("created_at")
-                    if created_at:
-                        try:
-                            dt = parse_datetime(created_at)
-                            if not stats[author]["last_activity"] or dt > stats[author]["last_activity"]:
-                                stats[author]["last_activity"] = dt
-                        except Exception:
-                            pass
+                if member_id is not None:
+                    attribute(member_id, "push_events", event.get("created_at"), push_data.get("ref"), push_data.get("commit_title") or "")
 
-            if len(events) < 100:
+            if len(push_events) < 100:
                 break
             page += 1
 
@@ -304,4 +297,4 @@ def get_project_activity(project_id, project_name, since_date, valid_names,debug
 
 
     
-    return stats
\ No newline at end of file
+    return stats
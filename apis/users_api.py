@@ -6,10 +6,23 @@ from utils.auth import get_gitlab_headers
 import requests
 from utils.auth import get_gitlab_headers  # adjust import if needed  # noqa: F811
 import streamlit as st
+import time
+from datetime import date
 from apis.commits_api import safe_api_request
+from utils.cache import PersistentCache
+from utils.metrics import in_current_run
 
 GITLAB_URL = "https://code.swecha.org"
 
+# Profile READMEs rarely change: found READMEs are trusted longer than misses
+README_CACHE = PersistentCache("readme_status")
+README_POSITIVE_TTL = 7 * 24 * 3600
+README_NEGATIVE_TTL = 24 * 3600
+
+# /users/:id payloads (public email, last activity) reused across runs for a day
+USER_DETAILS_CACHE = PersistentCache("user_details")
+USER_DETAILS_TTL = 24 * 3600
+
 def get_user_id(username):
     url = f"{GITLAB_URL}/api/v4/users"
     params = {"username": username}
@@ -90,37 +103,147 @@ def get_user_details(user_id):
     return response.json()
 
 
+def fetch_user_details_bulk(user_ids, max_workers=8, debug_mode=False, max_age=None):
+    """Fetch /users/:id for many users concurrently, served from the persistent cache when fresh.
 
+    ``max_age`` (seconds) additionally refetches cached entries older than that.
+    Returns {user_id: details}; users that could not be fetched are omitted.
+    """
+    details = {}
+    missing = []
+    for user_id in dict.fromkeys(user_ids):
+        entry = USER_DETAILS_CACHE.get_entry(user_id)
+        if entry is not None and (max_age is None or time.time() - entry["stored_at"] <= max_age):
+            details[user_id] = entry["value"]
+        else:
+            missing.append(user_id)
 
+    headers = get_gitlab_headers()
+    if missing and headers:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(in_current_run(safe_api_request), f"{GITLAB_API_URL}/users/{user_id}", headers, timeout=10): user_id
+                for user_id in missing
+            }
+            for future in as_completed(futures):
+                user_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                if result["success"]:
+                    details[user_id] = result["data"]
+                    USER_DETAILS_CACHE.set(user_id, result["data"], ttl=USER_DETAILS_TTL)
+                elif debug_mode:
+                    st.write(f"Failed to fetch user details for {user_id}: {result['error']}")
 
+    try:
+        USER_DETAILS_CACHE.save()
+    except OSError as e:
+        if debug_mode:
+            st.write(f"Could not persist user details cache: {e}")
+    return details
 
-def check_readme_exists_api(username,debug_mode=False):
-    """Check if user has a README in their profile repository"""
+
+
+
+
+
+README_FILENAMES = {"readme.md", "readme.rst", "readme.txt", "readme"}
+
+
+def _last_activity_on(details):
+    try:
+        return date.fromisoformat(details["last_activity_on"]) if details.get("last_activity_on") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def split_members_by_presence(members, since_date, max_workers=8, debug_mode=False):
+    """Split members into (present, idle) using /users/:id last_activity_on.
+
+    A member is idle when GitLab reports their last activity before
+    since_date; members without a reported date are kept as present. Idle
+    verdicts taken from the cache are re-checked against fresh data, since
+    a cached date can only understate recent activity.
+    """
+    since_day = since_date.date()
+    member_ids = [member["id"] for member in members]
+    details = fetch_user_details_bulk(member_ids, max_workers, debug_mode)
+
+    stale_idle = [
+        user_id for user_id in member_ids
+        if user_id in details and (_last_activity_on(details[user_id]) or since_day) < since_day
+    ]
+    if stale_idle:
+        details.update(fetch_user_details_bulk(stale_idle, max_workers, debug_mode, max_age=3600))
+
+    present, idle = [], []
+    for member in members:
+        last_seen = _last_activity_on(details.get(member["id"], {}))
+        (idle if last_seen and last_seen < since_day else present).append(member)
+    return present, idle
+
+
+def get_profile_readme_status(username, debug_mode=False):
+    """Check a user's profile repository (username/username) for a root README.
+
+    Uses one project lookup (existence, default branch, last activity) and one
+    root tree listing matched case-insensitively, instead of probing each
+    README name on each branch. ``error`` is set when the answer is unknown
+    (auth, 5xx, timeout, failed tree listing); only a 404 project or a
+    complete listing without a README count as "no README".
+    """
+    status = {"exists": False, "project_found": False, "last_activity_at": None, "error": None}
     headers = get_gitlab_headers()
     if not headers:
-        return False
-    
-    try:
-        # List of possible README file names and branches to check
-        readme_files = ["README.md", "readme.md", "README.MD", "README.rst", "README.txt", "README"]
-        branches = ["main", "master"]
-        
-        for readme_file in readme_files:
-            for branch in branches:
-                # Check for README in user's profile repository (username/username)
-                url = f"{GITLAB_URL}/api/v4/projects/{quote(username + '/' + username, safe='')}/repository/files/{quote(readme_file, safe='')}"
-                params = {"ref": branch}
-                
-                result = safe_api_request(url, headers, params, timeout=10)
-                if result["success"]:
-                    if debug_mode:
-                        st.write(f"✅ Found {readme_file} in {branch} branch for {username}")
-                    return True
-        
+        status["error"] = "No valid GitLab token found"
+        return status
+
+    project_url = f"{GITLAB_URL}/api/v4/projects/{quote(username + '/' + username, safe='')}"
+    project_result = safe_api_request(project_url, headers, timeout=10)
+    if not project_result["success"]:
+        if "(404)" not in project_result["error"]:
+            status["error"] = project_result["error"]
         if debug_mode:
-            st.write(f"❌ No README found for {username}")
-        return False
-        
+            st.write(f"❌ No profile project for {username}: {project_result['error']}")
+        return status
+
+    project = project_result["data"]
+    status["project_found"] = True
+    status["last_activity_at"] = project.get("last_activity_at")
+
+    default_branch = project.get("default_branch")
+    if not default_branch:  # Empty repository
+        return status
+
+    tree_url = f"{GITLAB_URL}/api/v4/projects/{project['id']}/repository/tree"
+    page = 1
+    while True:
+        params = {"ref": default_branch, "per_page": 100, "page": page}
+        tree_result = safe_api_request(tree_url, headers, params, timeout=10)
+        if not tree_result["success"]:
+            status["error"] = tree_result["error"]
+            break
+
+        entries = tree_result["data"] or []
+        if any(entry.get("type") == "blob" and entry.get("name", "").lower() in README_FILENAMES for entry in entries):
+            status["exists"] = True
+            break
+
+        if len(entries) < 100:
+            break
+        page += 1
+
+    if debug_mode:
+        st.write(f"{'✅ Found' if status['exists'] else '❌ No'} README on {default_branch} for {username}")
+    return status
+
+
+def check_readme_exists_api(username,debug_mode=False):
+    """Check if user has a README in their profile repository"""
+    try:
+        return get_profile_readme_status(username, debug_mode)["exists"]
     except Exception as e:
         if debug_mode:
             st.write(f"Error checking README for {username}: {e}")
@@ -129,9 +252,39 @@ def check_readme_exists_api(username,debug_mode=False):
 
 
 
-def fetch_readme_status(users, name_to_username,debug_mode=False):
-    """Fetch README status for multiple users in parallel"""
+def get_cached_readme_status(username, profile_last_activity=None, debug_mode=False):
+    """README status for one user, served from the persistent cache when possible.
+
+    A cached entry is reused until its TTL expires or, when the caller knows
+    the profile project's last_activity_at, until that timestamp changes.
+    """
+    key = username.lower()
+    entry = README_CACHE.get_entry(key)
+    if entry:
+        cached = entry["value"]
+        if profile_last_activity is None or profile_last_activity == cached.get("last_activity_at"):
+            return cached
+        if debug_mode:
+            st.write(f"♻️ Profile project of {username} changed, re-checking README")
+
+    status = get_profile_readme_status(username, debug_mode)
+    if status["error"]:
+        # Unknown is not "missing": keep it out of the cache so the next run asks again
+        return status
+    ttl = README_POSITIVE_TTL if status["exists"] else README_NEGATIVE_TTL
+    README_CACHE.set(key, status, ttl=ttl)
+    return status
+
+
+def fetch_readme_status(users, name_to_username,debug_mode=False, profile_activity=None):
+    """Fetch README status for multiple users in parallel.
+
+    ``profile_activity`` optionally maps lowercase usernames to the
+    last_activity_at of their username/username project (e.g. from the
+    already loaded project catalog) and is used to invalidate cache entries.
+    """
     statuses = {}
+    profile_activity = profile_activity or {}
     
     # Check which users have valid username mappings
     valid_users = []
@@ -150,8 +303,9 @@ def fetch_readme_status(users, name_to_username,debug_mode=False):
     # Process valid users
     with ThreadPoolExecutor(max_workers=6) as executor:  # Reduced workers to avoid rate limiting
         futures = {}
+        check = in_current_run(get_cached_readme_status)
         for user, username in valid_users:
-            futures[executor.submit(check_readme_exists_api, username)] = (user, username)
+            futures[executor.submit(check, username, profile_activity.get(username.lower()))] = (user, username)
         
         completed = 0
         total = len(futures)
@@ -159,10 +313,13 @@ def fetch_readme_status(users, name_to_username,debug_mode=False):
         for future in as_completed(futures):
             user, username = futures[future]
             try:
-                result = future.result()
-                statuses[user] = "✅" if result else "❌"
+                status = future.result()
+                if status.get("error"):
+                    statuses[user] = "❌ (error)"
+                else:
+                    statuses[user] = "✅" if status["exists"] else "❌"
                 if debug_mode:
-                    st.write(f"README check for {user} ({username}): {'✅' if result else '❌'}")
+                    st.write(f"README check for {user} ({username}): {statuses[user]}")
             except Exception as e:
                 statuses[user] = "❌ (error)"
                 if debug_mode:
@@ -172,4 +329,10 @@ def fetch_readme_status(users, name_to_username,debug_mode=False):
             if debug_mode and completed % 10 == 0:  # Show progress every 10 completions
                 st.write(f"README check progress: {completed}/{total}")
     
-    return statuses
\ No newline at end of file
+    try:
+        README_CACHE.save()
+    except OSError as e:
+        if debug_mode:
+            st.write(f"Could not persist README cache: {e}")
+    
+    return statuses
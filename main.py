@@ -1,6 +1,12 @@
 # main.py
 import argparse
+import contextlib
 import importlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 
 # Map user choice to module/function names
 MODE_MAP = {
@@ -31,17 +37,230 @@ def run_module(module_name, function_name):
     except Exception as e:
         print(f"[ERROR] Could not run {module_name}.{function_name}: {e}")
 
-def get_project_id_from_cli():
+def env_headers():
+    return {"PRIVATE-TOKEN": os.getenv("GITLAB_TOKEN")}
+
+def since_days(days):
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+# Headless jobs: each yields plain dicts, which are written as JSON Lines
+
+def job_commits(group, days=1):
+    from apis.commits_api import get_projects, get_commits_for_project
+    from utils.commit_classifier import classify_batch
+
+    headers = env_headers()
+    since = since_days(days)
+    for project in get_projects(group, strict=True):
+        commits = get_commits_for_project(project["id"], since, headers, strict=True)
+        for commit, category in zip(commits, classify_batch([c["title"] for c in commits])):
+            yield {
+                "project_id": project["id"],
+                "project": project.get("path_with_namespace", project["name"]),
+                "short_id": commit["short_id"],
+                "title": commit["title"],
+                "author_name": commit["author_name"],
+                "committed_date": commit.get("committed_date", commit["created_at"]),
+                "category": category,
+            }
+
+def job_members(group):
+    from apis.groups_api import get_group_members
+
+    result = get_group_members(group)
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+    for member in result["data"]:
+        yield {key: member.get(key) for key in ("id", "username", "name", "access_level", "state")}
+
+def job_issues(project=None, group=None, days=7):
+    from apis.issues_api import fetch_all_project_issues, fetch_group_issues, issue_project_path
+
+    since = since_days(days).isoformat()
+    if group:
+        issues = fetch_group_issues(env_headers(), group, since, strict=True)
+    else:
+        issues = fetch_all_project_issues(env_headers(), project, since, strict=True)
+    for issue in issues:
+        yield {
+            "id": issue["id"],
+            "iid": issue["iid"],
+            "project": issue_project_path(issue),
+            "title": issue["title"],
+            "state": issue["state"],
+            "labels": issue.get("labels", []),
+            "author": (issue.get("author") or {}).get("username"),
+            "assignees": [assignee["username"] for assignee in issue.get("assignees") or []],
+            "updated_at": issue["updated_at"],
+            "web_url": issue["web_url"],
+        }
+
+def job_mrs(project):
+    from apis.merge_api import get_merge_requests
+
+    for mr in get_merge_requests(project, strict=True):
+        yield {
+            "iid": mr["iid"],
+            "title": mr["title"],
+            "author": mr["author"]["username"],
+            "source_branch": mr.get("source_branch"),
+            "updated_at": mr.get("updated_at"),
+            "web_url": mr.get("web_url"),
+        }
+
+def job_file_check(project, path):
+    from apis.projects_api import check_file_in_project
+
+    yield {"project": project, "path": path, "exists": check_file_in_project(project, path)}
+
+def job_activity(group, days=7, workers=8):
+    """Per-member activity totals over every accessible project, like the dashboard's scan"""
+    from apis.groups_api import get_group_members
+    from apis.identity_api import build_identity_index
+    from apis.projects_api import get_all_accessible_projects, get_project_activity
+
+    members_result = get_group_members(group)
+    if not members_result["success"]:
+        raise RuntimeError(members_result["error"])
+    projects_result = get_all_accessible_projects()
+    if not projects_result["success"]:
+        raise RuntimeError(projects_result["error"])
+
+    members = members_result["data"]
+    identity_index = build_identity_index(members)
+    since = since_days(days)
+    projects = list({project["id"]: project for project in projects_result["data"]}.values())
+
+    totals = {
+        member["id"]: {"commits": 0, "merge_requests": 0, "issues": 0, "push_events": 0,
+                       "projects": set(), "last_activity": None}
+        for member in members
+    }
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(get_project_activity, project["id"], project["name"], since, identity_index)
+            for project in projects
+        ]
+        for future in as_completed(futures):
+            for member_id, stats in future.result().items():
+                if member_id not in totals:
+                    continue
+                member_totals = totals[member_id]
+                for kind in ("commits", "merge_requests", "issues", "push_events"):
+                    member_totals[kind] += stats[kind]
+                member_totals["projects"].update(stats["project_names"])
+                if stats["last_activity"] and (not member_totals["last_activity"]
+                                               or stats["last_activity"] > member_totals["last_activity"]):
+                    member_totals["last_activity"] = stats["last_activity"]
+
+    for member in members:
+        member_totals = totals[member["id"]]
+        yield {
+            "id": member["id"],
+            "username": member["username"],
+            "name": member["name"],
+            **{kind: member_totals[kind] for kind in ("commits", "merge_requests", "issues", "push_events")},
+            "projects": sorted(member_totals["projects"]),
+            "last_activity": member_totals["last_activity"],
+        }
+
+JOBS = {
+    "commits": job_commits,
+    "members": job_members,
+    "issues": job_issues,
+    "mrs": job_mrs,
+    "file-check": job_file_check,
+    "activity": job_activity,
+}
+
+def run_job(name, params, out=None):
+    """Stream one job's records as JSON Lines; returns False if the job failed"""
+    out = out or sys.stdout
+    ok = True
+    # The API helpers print progress and warnings; keep those off the JSON stream
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            for record in JOBS[name](**params):
+                out.write(json.dumps({"job": name, **record}, default=str) + "\n")
+                out.flush()
+        except Exception as e:
+            out.write(json.dumps({"job": name, "error": str(e)}) + "\n")
+            ok = False
+    return ok
+
+def run_batch(jobs_file):
+    """Run jobs listed one per line as {"job": "<name>", ...params} in this process.
+
+    All jobs share the pooled HTTP session and the in-memory caches.
+    """
+    out = sys.stdout
+    ok = True
+    with (sys.stdin if jobs_file == "-" else open(jobs_file, encoding="utf-8")) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                params = json.loads(line)
+                if not isinstance(params, dict) or "job" not in params:
+                    raise ValueError('expected {"job": "<name>", ...}')
+            except ValueError as e:
+                # A bad line fails only itself; the rest of the batch still runs
+                out.write(json.dumps({"job": None, "error": f"invalid job line {line_number}: {e}"}) + "\n")
+                ok = False
+                continue
+            name = params.pop("job")
+            if not isinstance(name, str) or name not in JOBS:
+                out.write(json.dumps({"job": name, "error": "unknown job"}) + "\n")
+                ok = False
+                continue
+            ok = run_job(name, params, out) and ok
+    return ok
+
+def build_parser():
     parser = argparse.ArgumentParser(description="Run GitLab automation tasks")
     parser.add_argument('--project-id', type=int, help='Project ID for GitLab operations')
-    args = parser.parse_args()
-    return args.project_id
+    sub = parser.add_subparsers(dest="command", metavar="command")
+
+    p = sub.add_parser("commits", help="commits of every project in a group")
+    p.add_argument("--group", required=True)
+    p.add_argument("--days", type=int, default=1)
+
+    p = sub.add_parser("members", help="members of a group")
+    p.add_argument("--group", required=True)
+
+    p = sub.add_parser("issues", help="issues updated recently in a project or group")
+    scope = p.add_mutually_exclusive_group(required=True)
+    scope.add_argument("--project")
+    scope.add_argument("--group")
+    p.add_argument("--days", type=int, default=7)
+
+    p = sub.add_parser("mrs", help="open merge requests of a project")
+    p.add_argument("--project", required=True)
+
+    p = sub.add_parser("file-check", help="whether a file exists in a project")
+    p.add_argument("--project", required=True, help="project path, e.g. group/project")
+    p.add_argument("--path", required=True)
+
+    p = sub.add_parser("activity", help="per-member activity totals for a group")
+    p.add_argument("--group", required=True)
+    p.add_argument("--days", type=int, default=7)
+    p.add_argument("--workers", type=int, default=8)
+
+    p = sub.add_parser("batch", help="run several jobs from a JSON Lines file ('-' for stdin)")
+    p.add_argument("jobs_file")
+    return parser
 
 def main():
-    project_id = get_project_id_from_cli()
+    args = build_parser().parse_args()
 
-    if project_id:
-        print(f"✅ Using Project ID from CLI: {project_id}")
+    if args.command == "batch":
+        sys.exit(0 if run_batch(args.jobs_file) else 1)
+    elif args.command:
+        params = {key: value for key, value in vars(args).items()
+                  if key not in ("command", "project_id") and value is not None}
+        sys.exit(0 if run_job(args.command, params) else 1)
+    elif args.project_id:
+        print(f"✅ Using Project ID from CLI: {args.project_id}")
         # Example: Run issue summary by default or any other logic
         from apis.issues_api import run_issues
         run_issues()
@@ -60,4 +279,4 @@ def main():
                 print("❌ Invalid choice. Please try again.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
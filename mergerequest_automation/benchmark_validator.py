@@ -0,0 +1,67 @@
+"""Timing check for profile_validator on adversarial READMEs.
+
+Each input family is grown 8x at a time; if validation time grows much
+faster than the input (i.e. backtracking creeps back in), the script exits
+non-zero.
+
+    python benchmark_validator.py
+"""
+import sys
+import time
+
+from profile_validator import PROFILE_TEMPLATE_EXAMPLE, validate_profile
+
+SIZES = (2_000, 16_000, 128_000, 1_024_000)
+# Allowed growth of time per byte between the smallest and largest input
+MAX_SLOWDOWN = 4.0
+
+
+def near_miss(size):
+    """A valid card padded to `size`, minus the last required section"""
+    card = PROFILE_TEMPLATE_EXAMPLE.split("## :star2:")[0]
+    padding = "Building things with Python and GitLab. " * (size // 40)
+    return card + padding
+
+def link_openers(size):
+    """Unterminated link syntax: every '[' and '$$' starts a failed match"""
+    return PROFILE_TEMPLATE_EXAMPLE + "[](http://" * (size // 10)
+
+def bracket_runs(size):
+    return PROFILE_TEMPLATE_EXAMPLE + "[" * size
+
+def dollar_runs(size):
+    return PROFILE_TEMPLATE_EXAMPLE + "$$" * (size // 2)
+
+def table_noise(size):
+    """One enormous table row full of separators and bold markers"""
+    return PROFILE_TEMPLATE_EXAMPLE + "| **" + "** | ** |" * (size // 8) + "\n"
+
+def heading_noise(size):
+    return PROFILE_TEMPLATE_EXAMPLE + "## :a:b:c:d About Me\n" * (size // 22)
+
+CASES = (near_miss, link_openers, bracket_runs, dollar_runs, table_noise, heading_noise)
+
+
+def time_once(content):
+    start = time.perf_counter()
+    validate_profile(content)
+    return time.perf_counter() - start
+
+def main():
+    failed = False
+    for case in CASES:
+        per_byte = []
+        print(f"\n{case.__name__}")
+        for size in SIZES:
+            content = case(size)
+            elapsed = min(time_once(content) for _ in range(3))
+            per_byte.append(elapsed / len(content))
+            print(f"  {len(content):>10,} bytes  {elapsed * 1000:9.2f} ms")
+        slowdown = per_byte[-1] / per_byte[0]
+        status = "ok" if slowdown <= MAX_SLOWDOWN else "SUPERLINEAR"
+        print(f"  time per byte x{slowdown:.2f} from smallest to largest: {status}")
+        failed = failed or slowdown > MAX_SLOWDOWN
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
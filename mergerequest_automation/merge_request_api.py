@@ -0,0 +1,46 @@
+"""Merge request calls used by sample.py and webhook_server.py.
+
+Every function raises requests.exceptions.RequestException on failure so
+callers can report the response and move on to the next MR.
+"""
+from typing import List, Optional
+
+import requests
+
+GITLAB_URL = "https://code.swecha.org"
+
+
+def _merge_requests_url(project_id) -> str:
+    return f"{GITLAB_URL}/api/v4/projects/{project_id}/merge_requests"
+
+def get_merge_requests(headers: dict, project_id, state: str = "opened") -> List[dict]:
+    url = _merge_requests_url(project_id)
+    mrs = []
+    page = 1
+    while True:
+        response = requests.get(url, headers=headers, params={"state": state, "page": page, "per_page": 100}, timeout=30)
+        response.raise_for_status()
+        page_mrs = response.json()
+        mrs.extend(page_mrs)
+        next_page = response.headers.get("X-Next-Page")
+        if not page_mrs or not next_page:
+            return mrs
+        page = int(next_page)
+
+def get_merge_request(headers: dict, project_id, mr_iid: int) -> dict:
+    response = requests.get(f"{_merge_requests_url(project_id)}/{mr_iid}", headers=headers, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+def accept_merge_request(headers: dict, project_id, mr_iid: int, sha: Optional[str] = None) -> dict:
+    """Merge an MR; with `sha` GitLab refuses (409) if the source branch moved past it"""
+    payload = {"sha": sha} if sha else {}
+    response = requests.put(f"{_merge_requests_url(project_id)}/{mr_iid}/merge", headers=headers, json=payload, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+def comment_on_merge_request(headers: dict, project_id, mr_iid: int, body: str) -> dict:
+    response = requests.post(f"{_merge_requests_url(project_id)}/{mr_iid}/notes", headers=headers,
+                             json={"body": body}, timeout=30)
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,146 @@
+import re
+from typing import Dict, List, Tuple
+
+import validators
+
+GITLAB_URL = "https://code.swecha.org"
+
+CARD_HEADING = "GitLab Profile Card"
+
+# Table fields in the order the card lists them; optional ones may be left blank
+REQUIRED_FIELDS = (
+    "Name",
+    "code.swecha.org Username",
+    "Profile Link",
+    "Bio",
+    "Location",
+    "Skills/Tech",
+    "Website/Portfolio",
+)
+OPTIONAL_FIELDS = ("Fun Fact",)
+
+REQUIRED_SECTIONS = ("About Me", "Sample Projects")
+
+PROFILE_TEMPLATE_EXAMPLE = """
+## :bust_in_silhouette: GitLab Profile Card
+
+| Field                   | Details                                  |
+|-------------------------|------------------------------------------|
+| **Name**                | Your Name                                |
+| **code.swecha.org Username** | your-username                       |
+| **Profile Link**        | [your-username](https://code.swecha.org/your-username) |
+| **Bio**                 | One line about you                       |
+| **Location**            | City                                     |
+| **Skills/Tech**         | Python, SQL, ...                         |
+| **Website/Portfolio**   | [portfolio](https://example.com)         |
+| **Fun Fact**            | (optional)                               |
+
+## :sparkles: About Me
+A few lines about yourself.
+
+## :star2: Sample Projects
+- [Project 1](https://code.swecha.org/your-username/project) - what it does
+"""
+
+# Both [text](url) and the $$text$$url$$ form earlier cards were written in.
+# Every repeat is a single bounded character class, so a scan from any start
+# position is capped and the whole search stays linear in the input.
+LINK_PATTERN = re.compile(
+    r"\[[^\[\]\n]{0,200}\]\((https?://[^()\[\]\s]{1,2048})\)"
+    r"|\$\$[^$\n]{0,200}\$\$(https?://[^$\s]{1,2048})\$\$"
+)
+SHORTCODE_PATTERN = re.compile(r":[a-z0-9_+-]{1,64}:")
+
+
+def _clean_heading(line: str) -> str:
+    """'## :sparkles: About Me' -> 'about me'"""
+    text = SHORTCODE_PATTERN.sub("", line.lstrip("#")).strip()
+    return " ".join(text.split()).casefold()
+
+def _table_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+def parse_profile(content: str) -> dict:
+    """Split a profile README into its card table fields and '##' sections in one pass.
+
+    Only string splitting and anchored checks are used per line, so the
+    cost is linear in the size of the README whatever it contains.
+    """
+    fields: Dict[str, str] = {}
+    sections: Dict[str, List[str]] = {}
+    headings: List[str] = []
+    current = None
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            heading = _clean_heading(stripped)
+            headings.append(heading)
+            current = sections.setdefault(heading, [])
+            continue
+
+        if stripped.startswith("|"):
+            cells = _table_cells(stripped)
+            if len(cells) >= 2 and cells[0].startswith("**") and cells[0].endswith("**") and len(cells[0]) > 4:
+                name = cells[0][2:-2].strip().casefold()
+                fields.setdefault(name, cells[1])
+                continue
+
+        if current is not None:
+            current.append(line)
+
+    return {
+        "fields": fields,
+        "sections": {heading: "\n".join(lines).strip() for heading, lines in sections.items()},
+        "headings": headings,
+    }
+
+def extract_links(text: str) -> List[str]:
+    return [match.group(1) or match.group(2) for match in LINK_PATTERN.finditer(text)]
+
+def validate_profile(content: str) -> Tuple[bool, List[str]]:
+    """Check a profile README against the card template; every error names the part that failed"""
+    profile = parse_profile(content)
+    fields = profile["fields"]
+    sections = profile["sections"]
+    errors = []
+
+    if not any(CARD_HEADING.casefold() in heading for heading in profile["headings"]) \
+            and CARD_HEADING.casefold() not in content.casefold():
+        errors.append(f"Missing the '{CARD_HEADING}' heading.")
+
+    for field in REQUIRED_FIELDS:
+        value = fields.get(field.casefold())
+        if value is None:
+            errors.append(f"Missing field '{field}' in the profile card table.")
+        elif not value:
+            errors.append(f"Field '{field}' is empty.")
+    for field in OPTIONAL_FIELDS:
+        if field.casefold() not in fields:
+            errors.append(f"Missing field '{field}' in the profile card table (it may be left blank).")
+
+    username = fields.get("code.swecha.org username", "").strip("`@ ")
+    profile_link = fields.get("profile link", "")
+    if username and profile_link:
+        links = extract_links(profile_link) or [profile_link]
+        expected = f"{GITLAB_URL}/{username}".casefold()
+        if not any(link.rstrip("/").casefold() == expected for link in links):
+            errors.append(f"Profile Link should point to {GITLAB_URL}/{username}.")
+
+    for heading in REQUIRED_SECTIONS:
+        key = heading.casefold()
+        body = next((text for name, text in sections.items() if name.endswith(key)), None)
+        if body is None:
+            errors.append(f"Missing the '{heading}' section.")
+        elif not body:
+            errors.append(f"The '{heading}' section is empty.")
+
+    projects = next((text for name, text in sections.items() if name.endswith("sample projects")), "")
+    if projects and not extract_links(projects):
+        errors.append("Sample Projects should link to at least one project.")
+
+    for url in dict.fromkeys(extract_links(content)):
+        if not validators.url(url):
+            errors.append(f"Invalid URL found: {url}")
+
+    return len(errors) == 0, errors
@@ -0,0 +1,34 @@
+"""Replay saved GitLab webhook payloads against a local webhook_server.
+
+    python replay_webhook.py payloads/*.json --url http://127.0.0.1:8088/
+
+Payloads can be copied from the project's Webhooks > Recent events page.
+"""
+import argparse
+import json
+import os
+
+import requests
+
+
+def replay(paths, url, token):
+    session = requests.Session()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            event = json.load(f)
+        response = session.post(url, json=event, headers={
+            "X-Gitlab-Event": "Merge Request Hook",
+            "X-Gitlab-Token": token,
+        })
+        print(f"{path}: {response.status_code} {response.text}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay GitLab webhook payloads")
+    parser.add_argument("payloads", nargs="+", help="JSON files with webhook request bodies")
+    parser.add_argument("--url", default="http://127.0.0.1:8088/")
+    parser.add_argument("--token", default=os.getenv("WEBHOOK_SECRET", ""))
+    args = parser.parse_args()
+    replay(args.payloads, args.url, args.token)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
 import os
-import re
-from typing import List, Tuple
-import validators
+import json
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+from urllib.parse import quote
 
 # Import API functions
-from add import (
+from merge_request_api import (
     get_merge_requests,
-    get_merge_request_changes,
     accept_merge_request,
     comment_on_merge_request
 )
+from profile_validator import PROFILE_TEMPLATE_EXAMPLE, validate_profile
 
 import requests  # Still needed for some things like exception catching
 
@@ -21,48 +25,16 @@ PROJECT_ID = "17159"
 HEADERS = {
     "Private-Token": ACCESS_TOKEN
 }
-
-SAMPLE_PROFILE_TEMPLATE = r"""
-:bust_in_silhouette: GitLab Profile Card
-\| Field.*Details.*
-\|-------------------\|------------------------------------------\|
-\| \*\*Name\*\*.*Gurram Ashok kumar.*
-\| \*\*code\.swecha\.org Username\*\*.*Ashokkumargurram.*
-\| \*\*Profile Link\*\*.*\$\$Ashokkumargurram\$\$https://code\.swecha\.org/Ashokkumargurram\$\$.*
-\| \*\*Bio\*\*.*Innovative tech enthusiast focused on AI.*
-\| \*\*Location\*\*.*Hyderabad.*
-\| \*\*Skills/Tech\*\*.*Python,FastAPI,Sql,Postgresql,N8N.*
-\| \*\*Website/Portfolio\*\*.*\$\$Ashokkumargurram\$\$https://www\.linkedin\.com/in/ashokkumar-gurram/.*\$\$.*
-\| \*\*Fun Fact\*\*.*
-## :sparkles: About Me.*
-Hi, Iam \*\*Gurram Ashok Kumar\*\*
-🧑‍💻 About Me.*
-I’m Gurram Ashok Kumar, a final-year B\.Tech Information Technology student.*
-Stock Prediction Model.*
-Image Caption Generator.*
-Clothing Classifier.*
-internship at Swecha.*
-TensorFlow, Pandas, Numpy.*
-Rotaract Club.*
-## :star2: Sample Projects.*
-- \$\$Project 1\$\$.*\/Ashokkumargurram\/gitlab.*AI corpus development.*
-- \$\$Project 2\$\$.*\/Ashokkumargurram\/Python_learning.*House price prediction.*
-"""
-
-PROFILE_REGEX_PATTERN = re.compile(SAMPLE_PROFILE_TEMPLATE.strip(), re.DOTALL)
+FETCH_WORKERS = 8
+VALIDATE_WORKERS = os.cpu_count() or 2
+# 0 accepts every valid profile in one pass
+MAX_ACCEPTS = int(os.getenv("MAX_ACCEPTS", "2"))
+INVALID_PROFILE_COMMENT = "Your profile card is invalid. Can you please check it once and update "
+# Profile files are cached by commit sha, which never changes content
+PROFILE_CACHE_PATH = os.path.join(os.getenv("DASHBOARD_CACHE_DIR", ".cache"), "profile_files.json")
 
 def validate_profile_template(content: str) -> Tuple[bool, List[str]]:
-    errors = []
-    match = PROFILE_REGEX_PATTERN.search(content)
-    if not match:
-        errors.append("Profile does not match the expected template layout.")
-
-    url_pattern = re.compile(r"\$\$[^$]+\$\$(https?://[^\s$]+)\$\$")
-    for match in url_pattern.finditer(content):
-        url = match.group(1)
-        if not validators.url(url):
-            errors.append(f"Invalid URL found: {url}")
-    return len(errors) == 0, errors
+    return validate_profile(content)
 
 def get_group_members(group_id: str) -> List[dict]:
     url = f"{GITLAB_URL}/api/v4/groups/{group_id}/members/all"
@@ -84,22 +56,187 @@ def get_group_members(group_id: str) -> List[dict]:
     print(f"Group members: {[member['username'] for member in members]}")
     return members
 
-def check_profile_in_changes(changes: dict) -> Tuple[bool, str, List[str]]:
-    for change in changes.get('changes', []):
-        file_path = change.get('new_path', '')
-        if 'readme.md' in file_path.lower() or 'profile' in file_path.lower():
-            new_file_content = change.get('diff', '')
-            added_lines = [line[1:] for line in new_file_content.split('\n') if line.startswith('+') and not line.startswith('+++')]
-            profile_content = '\n'.join(added_lines)
-            if profile_content.strip():
-                is_valid, errors = validate_profile_template(profile_content)
-                return True, profile_content, errors
-    return False, "", ["No profile file found in changes"]
-
-def process_merge_requests():
+def is_profile_path(file_path: str) -> bool:
+    return 'readme.md' in file_path.lower() or 'profile' in file_path.lower()
+
+# Anything else matching is_profile_path (profile.png, profile.pdf, ...) is not a card
+PROFILE_TEXT_EXTENSIONS = (".md", ".markdown", ".txt", ".rst")
+
+def profile_path_rank(diff: dict) -> Optional[int]:
+    """0 for a README.md, 1 for other Markdown, 2 for other text profile files; None if unusable"""
+    path = diff.get('new_path', '')
+    if diff.get('deleted_file') or not is_profile_path(path):
+        return None
+    # GitLab reports binary changes with an empty diff or a "Binary files ... differ" line;
+    # oversized text diffs are empty too but flagged too_large/collapsed
+    text = diff.get('diff') or ''
+    if text.startswith("Binary files") or not (text.strip() or diff.get('too_large') or diff.get('collapsed')):
+        return None
+    name = path.lower().rsplit('/', 1)[-1]
+    if name == 'readme.md':
+        return 0
+    if name.endswith(('.md', '.markdown')):
+        return 1
+    if name.endswith(PROFILE_TEXT_EXTENSIONS):
+        return 2
+    return None
+
+class ProfileFileCache:
+    """Profile file per (project, sha), persisted as JSON between runs"""
+
+    def __init__(self, path: str = PROFILE_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, entry: dict):
+        with self._lock:
+            self._entries[key] = entry
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+PROFILE_FILES = ProfileFileCache()
+
+def find_profile_path(mr_iid: int) -> Optional[str]:
+    """Best text profile file added/modified in an MR, paging through /diffs only until a README.md turns up"""
+    url = f"{GITLAB_URL}/api/v4/projects/{PROJECT_ID}/merge_requests/{mr_iid}/diffs"
+    best_path, best_rank = None, None
+    page = 1
+    while True:
+        response = requests.get(url, headers=HEADERS, params={"page": page, "per_page": 20})
+        response.raise_for_status()
+        diffs = response.json()
+        for diff in diffs:
+            rank = profile_path_rank(diff)
+            if rank == 0:
+                return diff['new_path']
+            if rank is not None and (best_rank is None or rank < best_rank):
+                best_path, best_rank = diff['new_path'], rank
+        next_page = response.headers.get("X-Next-Page")
+        if not diffs or not next_page:
+            return best_path
+        page = int(next_page)
+
+def fetch_raw_file(project_id, file_path: str, ref: str) -> str:
+    url = f"{GITLAB_URL}/api/v4/projects/{project_id}/repository/files/{quote(file_path, safe='')}/raw"
+    response = requests.get(url, headers=HEADERS, params={"ref": ref})
+    response.raise_for_status()
+    return response.text
+
+def fetch_profile_file(mr: dict) -> dict:
+    """{"path", "content"} of the MR's profile file exactly as committed at the MR head sha.
+
+    "path" is None when the MR touches no profile file. Results are cached
+    by sha, so an MR is only downloaded again after a new push.
+    """
+    source_project = mr.get('source_project_id') or PROJECT_ID
+    key = f"{source_project}:{mr['sha']}"
+    cached = PROFILE_FILES.get(key)
+    if cached is not None:
+        return cached
+
+    file_path = find_profile_path(mr['iid'])
+    entry = {"path": file_path, "content": None}
+    if file_path:
+        entry["content"] = fetch_raw_file(source_project, file_path, mr['sha'])
+    PROFILE_FILES.set(key, entry)
+    return entry
+
+def validate_merge_request(profile: dict) -> Tuple[bool, List[str]]:
+    """Validation step run in the process pool; only the verdict travels back"""
+    if not profile.get('path') or not (profile.get('content') or '').strip():
+        return False, ["No profile file found in changes"]
+    _, errors = validate_profile_template(profile['content'])
+    return True, errors
+
+def fetch_profiles(mrs: List[dict], max_workers: int = FETCH_WORKERS):
+    """Yield (mr, profile, error) as each MR's profile file arrives, fetched concurrently"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_profile_file, mr): mr for mr in mrs}
+        for future in as_completed(futures):
+            mr = futures[future]
+            try:
+                yield mr, future.result(), None
+            except Exception as e:
+                yield mr, None, e
+
+class MergeRequestWriter:
+    """Applies accept/comment actions one at a time from a single thread.
+
+    Validation runs in parallel, but merges into the same target branch
+    must not race each other, so every write goes through this queue.
+    With ``dry_run`` the actions are only printed.
+    """
+
+    def __init__(self, max_accepts: int = 0, dry_run: bool = False):
+        self.max_accepts = max_accepts
+        self.dry_run = dry_run
+        self.accepted = 0
+        self.commented = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, action: str, mr_iid: int, sha: Optional[str] = None):
+        """Queue an action; an accept with `sha` only merges that exact head commit"""
+        self._queue.put((action, mr_iid, sha))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            action, mr_iid, sha = item
+            if self.dry_run:
+                print(f"📝 [dry run] would {action} MR #{mr_iid}")
+                continue
+            try:
+                if action == "accept":
+                    if self.max_accepts and self.accepted >= self.max_accepts:
+                        print(f"⏭️  Skipping MR #{mr_iid}: accept limit of {self.max_accepts} reached")
+                        continue
+                    print(f"🚀 Accepting merge request #{mr_iid}...")
+                    accept_merge_request(HEADERS, PROJECT_ID, mr_iid, sha=sha)
+                    print(f"✅ Merge request #{mr_iid} has been accepted!")
+                    self.accepted += 1
+                else:
+                    comment_on_merge_request(HEADERS, PROJECT_ID, mr_iid, INVALID_PROFILE_COMMENT)
+                    self.commented += 1
+            except requests.exceptions.RequestException as e:
+                self.failed += 1
+                print(f"❌ Error processing MR #{mr_iid}: {e}, Response: {e.response.text if e.response else 'No response'}")
+            except Exception as e:
+                self.failed += 1
+                print(f"🐛 Unexpected error with MR #{mr_iid}: {e}")
+
+def process_merge_requests(max_accepts: int = MAX_ACCEPTS):
     print("🔍 Fetching group members...")
     members = get_group_members(GROUP_ID)
-    usernames = [member["username"].lower() for member in members]
+    usernames = {member["username"].lower() for member in members}
 
     print("📋 Fetching open merge requests...")
     try:
@@ -111,50 +248,61 @@ def process_merge_requests():
     print(f"\n📊 Found {len(mrs)} open merge requests")
     print("=" * 50)
 
-    accepted_count = 0
+    candidates = []
     for mr in mrs:
-        if accepted_count >= 2:
-            print("✅ Processed 2 valid profiles. Exiting.")
-            break
-
-        mr_iid = mr['iid']
         author = mr['author']['username']
-        title = mr['title']
-        print(f"\n🔍 Checking MR #{mr_iid}: {title}")
-        print(f"👤 Author: {author}")
         if author.lower() not in usernames:
-            print(f"⚠️  Author {author} is not a group member")
+            print(f"⚠️  MR #{mr['iid']}: author {author} is not a group member")
             continue
+        candidates.append(mr)
 
-        try:
-            changes = get_merge_request_changes(HEADERS, PROJECT_ID, mr_iid)
-            has_profile, profile_content, validation_errors = check_profile_in_changes(changes)
-            if not has_profile:
-                print("❌ No profile found in changes")
-                continue
-            if validation_errors:
-                print("❌ Profile template validation failed:")
-                for error in validation_errors:
-                    print(f"   - {error}")
+    # Profile files are fetched concurrently, validated in worker processes as
+    # they arrive, and the resulting accept/comment actions are applied serially
+    writer = MergeRequestWriter(max_accepts)
+    try:
+        # Workers are started while the fetch and writer threads are running;
+        # forking a process with live threads can deadlock, so spawn them
+        with ProcessPoolExecutor(max_workers=VALIDATE_WORKERS,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            validations = {}
+            for mr, profile, error in fetch_profiles(candidates):
+                if error is not None:
+                    print(f"❌ Error fetching profile file for MR #{mr['iid']}: {error}")
+                    continue
+                validations[pool.submit(validate_merge_request, profile)] = mr
+
+            for future in as_completed(validations):
+                mr = validations[future]
+                mr_iid = mr['iid']
                 try:
-                    comment_msg = "Your profile card is invalid. Can you please check it once and update "
-                    comment_on_merge_request(HEADERS, PROJECT_ID, mr_iid, comment_msg)
-                except Exception as comment_err:
-                    print(f"⚠️  Failed to comment on MR #{mr_iid}: {comment_err}")
-                continue
-            print("✅ Profile template is valid!")
-            print("🚀 Accepting merge request...")
-            accept_merge_request(HEADERS, PROJECT_ID, mr_iid)
-            print(f"✅ Merge request #{mr_iid} has been accepted!")
-            accepted_count += 1
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error processing MR #{mr_iid}: {e}, Response: {e.response.text if e.response else 'No response'}")
-        except Exception as e:
-            print(f"🐛 Unexpected error with MR #{mr_iid}: {e}")
+                    has_profile, validation_errors = future.result()
+                except Exception as e:
+                    print(f"🐛 Unexpected error validating MR #{mr_iid}: {e}")
+                    continue
+
+                if not has_profile:
+                    print(f"❌ MR #{mr_iid}: no profile found in changes")
+                elif validation_errors:
+                    print(f"❌ MR #{mr_iid} ({mr['title']}): profile template validation failed:")
+                    for error in validation_errors:
+                        print(f"   - {error}")
+                    writer.submit("comment", mr_iid)
+                else:
+                    print(f"✅ MR #{mr_iid} ({mr['title']}): profile template is valid!")
+                    writer.submit("accept", mr_iid, mr['sha'])
+    finally:
+        writer.close()
+        try:
+            PROFILE_FILES.save()
+        except OSError as e:
+            print(f"⚠️  Could not persist profile file cache: {e}")
+
+    print(f"\n📈 {writer.accepted} accepted, {writer.commented} commented, {writer.failed} failed "
+          f"out of {len(candidates)} candidate MR(s)")
 
 def display_template_example():
     print("\n📋 **Sample Profile Template Format:**")
-    print(SAMPLE_PROFILE_TEMPLATE.strip())
+    print(PROFILE_TEMPLATE_EXAMPLE.strip())
 
 def main():
     if not ACCESS_TOKEN or not GROUP_ID or not PROJECT_ID:
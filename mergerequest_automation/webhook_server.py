@@ -0,0 +1,231 @@
+"""GitLab merge request webhook receiver for the profile-card auto-merger.
+
+Instead of polling every open MR and refetching all group members on each
+run, GitLab pushes an event whenever an MR is opened, reopened or updated,
+and only that MR is validated and accepted or commented on.
+
+    WEBHOOK_SECRET=... python webhook_server.py --port 8088 [--dry-run]
+
+Configure the project webhook (Merge request events) to POST to
+http://<host>:8088/ with the same secret token. The payload only says which
+MR to look at; its head sha, source project and author are re-read from the
+API before validating. replay_webhook.py posts saved payloads for local
+testing.
+"""
+import argparse
+import hmac
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from merge_request_api import get_merge_request
+from sample import (
+    GROUP_ID,
+    HEADERS,
+    PROJECT_ID,
+    MergeRequestWriter,
+    fetch_profile_file,
+    get_group_members,
+    validate_merge_request,
+    PROFILE_FILES,
+)
+
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+MEMBER_REFRESH_SECONDS = int(os.getenv("MEMBER_REFRESH_SECONDS", "600"))
+HANDLED_ACTIONS = {"open", "reopen", "update"}
+
+
+class MemberSet:
+    """Group member ids and usernames, refreshed in the background every `interval` seconds"""
+
+    def __init__(self, group_id, interval=MEMBER_REFRESH_SECONDS):
+        self.group_id = group_id
+        self.interval = interval
+        self.ids = frozenset()
+        self.usernames = frozenset()
+        self._stop = threading.Event()
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def refresh(self):
+        members = get_group_members(self.group_id)
+        # Swap whole sets so readers never see a half-built one
+        self.ids = frozenset(member["id"] for member in members)
+        self.usernames = frozenset(member["username"].lower() for member in members)
+        print(f"👥 Member set refreshed: {len(self.ids)} member(s)")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️  Member refresh failed, keeping the previous set: {e}")
+
+    def stop(self):
+        self._stop.set()
+
+    def __contains__(self, author):
+        author_id, username = author
+        return author_id in self.ids or (username or "").lower() in self.usernames
+
+
+def merge_request_from_event(event):
+    """{"iid", "title"} of the MR a merge_request hook payload is about, or None to ignore it"""
+    if event.get("object_kind") != "merge_request":
+        return None
+    attrs = event.get("object_attributes") or {}
+    if str(attrs.get("target_project_id")) != str(PROJECT_ID):
+        return None
+    if attrs.get("state") != "opened" or attrs.get("action") not in HANDLED_ACTIONS:
+        return None
+    # Title or label edits also send "update"; only new commits can change the profile
+    if attrs.get("action") == "update" and not attrs.get("oldrev"):
+        return None
+    return {"iid": attrs["iid"], "title": attrs.get("title", "")}
+
+def merge_request_from_api(mr_iid):
+    """The fields the pipeline needs, as GitLab reports them now rather than as the payload claims"""
+    mr = get_merge_request(HEADERS, PROJECT_ID, mr_iid)
+    author = mr.get("author") or {}
+    return {
+        "iid": mr["iid"],
+        "title": mr.get("title", ""),
+        "state": mr.get("state"),
+        "sha": mr.get("sha"),
+        "source_project_id": mr.get("source_project_id"),
+        "author_id": author.get("id"),
+        "author": {"username": author.get("username")},
+    }
+
+
+class MergeRequestWorker:
+    """Validates queued MRs one by one and hands the verdicts to the serialized writer"""
+
+    def __init__(self, members, writer):
+        self.members = members
+        self.writer = writer
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, mr):
+        self._queue.put(mr)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            event_mr = self._queue.get()
+            if event_mr is None:
+                return
+            started = time.monotonic()
+            try:
+                self.handle(merge_request_from_api(event_mr["iid"]))
+            except requests.exceptions.RequestException as e:
+                print(f"❌ Error fetching MR #{event_mr['iid']}: {e}")
+            except Exception as e:
+                print(f"🐛 Unexpected error with MR #{event_mr['iid']}: {e}")
+            print(f"⏱️  MR #{event_mr['iid']} handled in {time.monotonic() - started:.2f}s")
+
+    def handle(self, mr):
+        mr_iid = mr["iid"]
+        if mr["state"] != "opened" or not mr["sha"]:
+            print(f"⚠️  MR #{mr_iid}: no longer open ({mr['state']})")
+            return
+        if (mr["author_id"], mr["author"]["username"]) not in self.members:
+            print(f"⚠️  MR #{mr_iid}: author is not a group member")
+            return
+
+        has_profile, validation_errors = validate_merge_request(fetch_profile_file(mr))
+        PROFILE_FILES.save()
+        if not has_profile:
+            print(f"❌ MR #{mr_iid}: no profile found in changes")
+        elif validation_errors:
+            print(f"❌ MR #{mr_iid} ({mr['title']}): profile template validation failed:")
+            for error in validation_errors:
+                print(f"   - {error}")
+            self.writer.submit("comment", mr_iid)
+        else:
+            print(f"✅ MR #{mr_iid} ({mr['title']}): profile template is valid!")
+            self.writer.submit("accept", mr_iid, mr["sha"])
+
+
+def make_handler(worker, secret):
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, message):
+            body = json.dumps({"status": message}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply(200, "ok")
+
+        def do_POST(self):
+            token = self.headers.get("X-Gitlab-Token", "")
+            if secret and not hmac.compare_digest(token, secret):
+                self._reply(401, "invalid token")
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                event = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._reply(400, "invalid JSON")
+                return
+
+            mr = merge_request_from_event(event)
+            if mr is None:
+                self._reply(200, "ignored")
+                return
+            # GitLab times out slow hooks, so acknowledge first and work in the background
+            worker.submit(mr)
+            self._reply(202, f"queued MR #{mr['iid']}")
+
+        def log_message(self, format, *args):
+            print(f"🌐 {self.address_string()} {format % args}")
+
+    return WebhookHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile-card merge request webhook receiver")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--dry-run", action="store_true", help="print accept/comment actions instead of applying them")
+    args = parser.parse_args()
+
+    if not WEBHOOK_SECRET:
+        if not args.dry_run:
+            sys.exit("❌ WEBHOOK_SECRET is not set; refusing to merge on unauthenticated requests (use --dry-run to test)")
+        print("⚠️  WEBHOOK_SECRET is not set; every request will be accepted")
+
+    members = MemberSet(GROUP_ID)
+    # MAX_ACCEPTS caps a single batch run of sample.py; this writer lives as long as
+    # the server, so a cap there would stop all merging once reached
+    writer = MergeRequestWriter(0, dry_run=args.dry_run)
+    worker = MergeRequestWorker(members, writer)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(worker, WEBHOOK_SECRET))
+    print(f"🎧 Listening for merge request hooks on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        members.stop()
+        worker.close()
+        writer.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# utils/activity_series.py
+from datetime import datetime
+import numpy as np
+
+ACTIVITY_KINDS = ("commits", "merge_requests", "issues", "push_events")
+
+
+def series_length(since_date, until_date=None):
+    """Number of calendar days covered by the analysis window (inclusive)"""
+    until_date = until_date or datetime.now()
+    return max((until_date.date() - since_date.date()).days + 1, 1)
+
+
+def new_series(n_days):
+    """Create an empty per-day counter array for one user and activity kind"""
+    return np.zeros(n_days, dtype=np.uint32)
+
+
+def new_daily_counts(n_days):
+    """Create the per-kind daily counters for one user"""
+    return {kind: new_series(n_days) for kind in ACTIVITY_KINDS}
+
+
+def day_offset(dt, since_date):
+    """Day index of a timestamp relative to since_date, in since_date's timezone"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(since_date.tzinfo) if since_date.tzinfo else dt.astimezone().replace(tzinfo=None)
+    return (dt.date() - since_date.date()).days
+
+
+def record_day(series, dt, since_date):
+    """Increment the bucket for dt; events outside the window are ignored"""
+    offset = day_offset(dt, since_date)
+    if 0 <= offset < len(series):
+        series[offset] += 1
+
+
+def merge_daily_counts(target, source):
+    """Add one project's daily counters into a user's running totals in place"""
+    for kind, series in source.items():
+        target[kind] += series
+
+
+def total_series(daily_counts):
+    """Sum all activity kinds into a single per-day series"""
+    return np.sum(np.stack(list(daily_counts.values())), axis=0)
+
+
+def longest_streak(series):
+    """Longest run of consecutive active days"""
+    active = np.concatenate(([0], (np.asarray(series) > 0).astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(active))
+    if not len(edges):
+        return 0
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def current_streak(series):
+    """Run of consecutive active days ending today (or yesterday, if today is still quiet)"""
+    active = np.asarray(series) > 0
+    if len(active) and not active[-1]:
+        active = active[:-1]
+    idle = np.flatnonzero(~active)
+    return int(len(active) - idle[-1] - 1) if len(idle) else int(len(active))
+
+
+def weekly_totals(series):
+    """Sum a daily series into 7-day buckets aligned to the end of the window"""
+    series = np.asarray(series)
+    pad = (-len(series)) % 7
+    padded = np.concatenate((np.zeros(pad, dtype=series.dtype), series))
+    return padded.reshape(-1, 7).sum(axis=1)
+
+
+def week_over_week(series):
+    """Percent change of the last 7 days against the 7 days before, or None"""
+    weeks = weekly_totals(series)
+    if len(weeks) < 2 or weeks[-2] == 0:
+        return None
+    return float((int(weeks[-1]) - int(weeks[-2])) / int(weeks[-2]) * 100)
@@ -0,0 +1,92 @@
+# utils/cache.py
+import json
+import os
+import tempfile
+import threading
+import time
+
+from utils.metrics import record_cache
+
+CACHE_DIR = os.getenv("DASHBOARD_CACHE_DIR", ".cache")
+
+
+class PersistentCache:
+    """JSON-file backed key/value store with per-entry expiry.
+
+    Entries survive dashboard reruns and restarts. The file is loaded lazily
+    and rewritten atomically by save(), so callers batch their writes and
+    save once per run.
+    """
+
+    def __init__(self, name, cache_dir=None):
+        self.path = os.path.join(cache_dir or CACHE_DIR, f"{name}.json")
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get_entry(self, key):
+        """Return the raw entry ({"value", "stored_at", "expires_at"}) if still fresh"""
+        with self._lock:
+            entry = self._load().get(str(key))
+            if entry and entry.get("expires_at") is not None and entry["expires_at"] < time.time():
+                entry = None
+        record_cache(entry is not None)
+        return entry
+
+    def get(self, key, default=None):
+        entry = self.get_entry(key)
+        return entry["value"] if entry else default
+
+    def set(self, key, value, ttl=None):
+        """Store value; ttl in seconds, None keeps it until explicitly replaced"""
+        now = time.time()
+        with self._lock:
+            self._load()[str(key)] = {
+                "value": value,
+                "stored_at": now,
+                "expires_at": now + ttl if ttl is not None else None,
+            }
+            self._dirty = True
+
+    def delete(self, key):
+        with self._lock:
+            if self._load().pop(str(key), None) is not None:
+                self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+    def save(self):
+        """Drop expired entries and write the cache file atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            entries = {
+                key: entry for key, entry in self._load().items()
+                if entry.get("expires_at") is None or entry["expires_at"] >= now
+            }
+            self._entries = entries
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._dirty = False
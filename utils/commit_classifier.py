@@ -0,0 +1,91 @@
+# utils/commit_classifier.py
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+# (category, label, keywords) in priority order: when a message contains
+# keywords of several categories, the earliest category wins
+CATEGORY_RULES = (
+    ("fix", "🛠️ Bug fix", ("fix", "bug", "error")),
+    ("feature", "➕ New feature", ("add", "create", "new")),
+    ("update", "🔄 Update", ("update", "upgrade", "improve")),
+    ("removal", "❌ Removal", ("remove", "delete", "clean")),
+    ("refactor", "♻️ Code refactor", ("refactor",)),
+    ("merge", "🔀 Merge", ("merge",)),
+)
+OTHER = "other"
+
+CATEGORY_LABELS = {category: label for category, label, _ in CATEGORY_RULES}
+PRIORITY = {category: rank for rank, (category, _, _) in enumerate(CATEGORY_RULES)}
+
+# Conventional Commit types, mapped onto the categories above
+CONVENTIONAL_TYPES = {
+    "fix": "fix",
+    "hotfix": "fix",
+    "feat": "feature",
+    "feature": "feature",
+    "perf": "update",
+    "chore": "update",
+    "build": "update",
+    "ci": "update",
+    "deps": "update",
+    "docs": "update",
+    "style": "update",
+    "test": "update",
+    "revert": "removal",
+    "refactor": "refactor",
+    "merge": "merge",
+}
+CONVENTIONAL_PATTERN = re.compile(r"\s*([a-z]+)(?:\([^)\n]*\))?!?:")
+
+# One pass over the message finds every keyword occurrence. The lookahead
+# makes matches zero-width, so overlapping keywords are all seen, exactly
+# like testing each keyword with `in`.
+KEYWORD_PATTERN = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+        for category, _, keywords in CATEGORY_RULES
+    ) + ")"
+)
+
+
+@lru_cache(maxsize=65536)
+def classify(message):
+    """Category of one commit title: Conventional Commit type first, then keywords"""
+    message = (message or "").lower()
+
+    conventional = CONVENTIONAL_PATTERN.match(message)
+    if conventional and conventional.group(1) in CONVENTIONAL_TYPES:
+        return CONVENTIONAL_TYPES[conventional.group(1)]
+
+    best = None
+    for match in KEYWORD_PATTERN.finditer(message):
+        category = match.lastgroup
+        if best is None or PRIORITY[category] < PRIORITY[best]:
+            best = category
+            if PRIORITY[best] == 0:
+                break
+    return best or OTHER
+
+def classify_batch(messages):
+    """Categories for many titles in one call; repeated titles are classified once"""
+    unique = {message: classify(message) for message in dict.fromkeys(messages)}
+    return [unique[message] for message in messages]
+
+def label_for(message, category):
+    if category == OTHER:
+        return "📝 " + (message or "").lower().capitalize()
+    return CATEGORY_LABELS[category]
+
+def summarize_batch(messages):
+    """Display labels for many titles, as summarize_commit would give them"""
+    return [label_for(message, category) for message, category in zip(messages, classify_batch(messages))]
+
+def author_category_counts(commits):
+    """{author_name: Counter({category: n})} for a list of commit dicts"""
+    commits = list(commits)
+    categories = classify_batch([commit.get('title', '') for commit in commits])
+    counts = defaultdict(Counter)
+    for commit, category in zip(commits, categories):
+        counts[commit.get('author_name', 'Unknown')][category] += 1
+    return dict(counts)
@@ -0,0 +1,190 @@
+# utils/export.py
+import csv
+import gzip
+import io
+import math
+import tempfile
+from itertools import islice
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "CSV (gzip)": {"extension": "csv.gz", "mime": "application/gzip"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+RAW_ACTIVITY_COLUMNS = ["project_id", "project", "kind", "author", "timestamp", "ref", "title"]
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def available_formats():
+    """Export formats usable in this environment (Parquet needs pyarrow)"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "Parquet" or parquet_available()]
+
+
+def export_filename(prefix, fmt, timestamp):
+    return f"{prefix}_{timestamp}.{EXPORT_FORMATS[fmt]['extension']}"
+
+
+def iter_batches(rows, batch_size=EXPORT_BATCH_SIZE):
+    """Yield lists of at most batch_size rows from any iterable"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def dataframe_column_types(df):
+    """Parquet column types for a DataFrame's columns, taken from its dtypes"""
+    types = {}
+    for column, dtype in df.dtypes.items():
+        if dtype.kind == "b":
+            types[column] = "bool"
+        elif dtype.kind in "iu":
+            types[column] = "int64"
+        elif dtype.kind == "f":
+            types[column] = "float64"
+    return types
+
+
+def dataframe_rows(df):
+    """Yield a DataFrame's rows as dicts without materialising them all at once"""
+    columns = list(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        yield dict(zip(columns, values))
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _cell(value):
+    """One CSV cell; missing values (None, NaN) are left empty, as DataFrame.to_csv did"""
+    if _is_missing(value):
+        return ""
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return "; ".join(sorted(str(v) for v in value))
+    return value
+
+
+def _write_csv(rows, columns, fileobj, batch_size):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    for batch in iter_batches(rows, batch_size):
+        writer.writerows([_cell(row.get(col)) for col in columns] for row in batch)
+    text.flush()
+    text.detach()
+
+
+def _parquet_value(value, kind):
+    """Coerce one cell to its column's declared type; values that do not fit become null"""
+    if _is_missing(value):
+        return None
+    value = _cell(value)
+    try:
+        if kind == "int64":
+            return int(value)
+        if kind == "float64":
+            return float(value)
+        if kind == "bool":
+            return bool(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+def _write_parquet(rows, columns, fileobj, batch_size, column_types=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # The schema is fixed up front: inferring it from the first batch breaks
+    # as soon as a later batch holds a different type in the same column
+    kinds = {col: (column_types or {}).get(col, "string") for col in columns}
+    schema = pa.schema([(col, pa.type_for_alias(kinds[col])) for col in columns])
+
+    with pq.ParquetWriter(fileobj, schema) as writer:
+        for batch in iter_batches(rows, batch_size):
+            data = {col: [_parquet_value(row.get(col), kinds[col]) for row in batch] for col in columns}
+            writer.write_table(pa.table(data, schema=schema))
+
+
+def export_rows(rows, columns, fmt="CSV", fileobj=None, batch_size=EXPORT_BATCH_SIZE, column_types=None):
+    """Stream rows (dicts) to CSV, gzip-compressed CSV or Parquet in fixed-size batches.
+
+    With fileobj (binary) the output is written there and the file is
+    returned rewound. Without one, rows are spooled through an anonymous
+    temporary file and the finished export is returned as bytes, the form
+    st.download_button accepts. ``column_types`` maps columns to Parquet
+    types ("int64", "float64", "bool"); other columns are written as strings.
+    Missing values (None, NaN) become empty CSV cells and Parquet nulls:
+
+    >>> export_rows([{"a": 1, "b": float("nan")}, {"a": None, "b": 2.5}], ["a", "b"]).decode().splitlines()
+    ['a,b', '1,', ',2.5']
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fileobj is None:
+        with tempfile.TemporaryFile() as spool:
+            export_rows(rows, columns, fmt, spool, batch_size, column_types)
+            return spool.read()
+
+    if fmt == "CSV":
+        _write_csv(rows, columns, fileobj, batch_size)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=fileobj, mode="wb") as gz:
+            _write_csv(rows, columns, gz, batch_size)
+    else:
+        _write_parquet(rows, columns, fileobj, batch_size, column_types)
+
+    fileobj.seek(0)
+    return fileobj
+
+
+class ActivityEventSpool:
+    """Append-only on-disk buffer for raw activity events.
+
+    Events are written to a temporary CSV as each project finishes, so only
+    the batch currently being written is held in memory.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns or RAW_ACTIVITY_COLUMNS
+        self.count = 0
+        self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def append(self, events):
+        self._writer.writerows(events)
+        self.count += len(events)
+
+    def rows(self):
+        """Re-read the spooled events in order"""
+        self._file.flush()
+        self._file.seek(0)
+        yield from csv.DictReader(self._file)
+        self._file.seek(0, io.SEEK_END)
+
+    def export(self, fmt="CSV", batch_size=EXPORT_BATCH_SIZE):
+        return export_rows(self.rows(), self.columns, fmt, batch_size=batch_size)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
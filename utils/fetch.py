@@ -1,8 +1,19 @@
 # utils/fetch.py
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from utils.metrics import record_request
+
+# One pooled session per process, so every helper (and every job of a
+# batch run) reuses the same keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
 def make_api_request(url, headers, params=None, return_raw=False):
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = SESSION.get(url, headers=headers, params=params, timeout=30)
+        record_request(len(response.content), error=not response.ok)
         response.raise_for_status()
         return response.text if return_raw else response.json()
     except requests.exceptions.RequestException as e:
@@ -25,4 +36,61 @@ def fetch_paginated_data(url_base, headers, extra_params=None):
         if len(data) < per_page:
             break
         page += 1
-    return results
\ No newline at end of file
+    return results
+
+def fetch_all_pages(url_base, headers, extra_params=None, per_page=100, timeout=30):
+    """Like fetch_paginated_data, but raises requests.RequestException on any failed page.
+
+    For callers that cache or checkpoint the result, where a silently
+    truncated list would be stored as if it were complete.
+    """
+    results = []
+    page = 1
+    while True:
+        params = {'page': page, 'per_page': per_page}
+        if extra_params:
+            params.update(extra_params)
+        try:
+            response = SESSION.get(url_base, headers=headers, params=params, timeout=timeout)
+        except requests.exceptions.RequestException:
+            record_request(error=True)
+            raise
+        record_request(len(response.content), error=not response.ok)
+        response.raise_for_status()
+        data = response.json()
+        results.extend(data)
+        if len(data) < per_page:
+            return results
+        page += 1
+
+def make_api_write(method, url, headers, data=None, retries=3, timeout=30):
+    """Send a POST/PUT/DELETE request and report the outcome instead of raising.
+
+    Returns {"success", "status", "data"} or {"success", "status", "error"};
+    429 responses are retried after the server's Retry-After delay.
+    """
+    for attempt in range(retries):
+        try:
+            response = SESSION.request(method, url, headers=headers, data=data, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            record_request(retry=attempt > 0, error=True)
+            if attempt == retries - 1:
+                return {"success": False, "status": None, "error": str(e)}
+            time.sleep(2 ** attempt)
+            continue
+
+        record_request(len(response.content), retry=attempt > 0, error=not response.ok)
+        if response.status_code == 429 and attempt < retries - 1:
+            time.sleep(float(response.headers.get("Retry-After", 2 ** attempt)))
+            continue
+
+        try:
+            body = response.json() if response.content else None
+        except ValueError:
+            body = response.text
+        if response.ok:
+            return {"success": True, "status": response.status_code, "data": body}
+        message = body.get("message", body) if isinstance(body, dict) else body
+        return {"success": False, "status": response.status_code, "error": f"HTTP {response.status_code}: {message}"}
+
+    return {"success": False, "status": None, "error": "Max retries exceeded"}
@@ -1,10 +1,8 @@
+import html
 from datetime import datetime
+from io import StringIO
 
-def generate_summary(categorized):
-    """Generate HTML summary for standup"""
-    current_date = datetime.now().strftime("%B %d, %Y")
-
-    summary = f"""<html>
+PAGE_HEAD = """<html>
 <head>
 <style>
 body {{
@@ -99,63 +97,80 @@ a:hover {{ text-decoration: underline; }}
 </head>
 <body>
 <div class="container">
-<h1>📅 Daily Standup Summary - {current_date}</h1>
-<h2>📌 Project: Graduate Volunteers</h2>"""
+<h1>📅 Daily Standup Summary - {date}</h1>
+<h2>📌 {heading}</h2>"""
 
-    for name, tasks in categorized.items():
-        summary += f"<h2>👤 {name}</h2>\n"
+PAGE_FOOT = """
+</div>
+</body>
+</html>"""
 
-        total_tasks = len(tasks.get('yesterday', [])) + len(tasks.get('today', [])) + len(tasks.get('blockers', []))
+MEMBER_HEADING = "<h2>👤 {name}</h2>\n"
+NO_TASKS = "<div class='no-tasks'>No relevant tasks found for this user.</div>"
+TABLE_HEAD = "<table><tr><th>Status</th><th>Labels</th><th>Task Title</th><th>Summary</th></tr>"
+TABLE_FOOT = "</table>"
 
-        if total_tasks == 0:
-            summary += "<div class='no-tasks'>No relevant tasks found for this user.</div>"
-            continue
+ROW = """
+<tr class='{css}'>
+    <td>{status}</td>
+    <td>{labels}</td>
+    <td><a href='{url}'>{title}</a>{project}</td>
+    <td>{summary}</td>
+</tr>"""
+LABEL = "<span class='labels'>{}</span>"
+PROJECT = "<br><small>📁 {}</small>"
 
-        summary += "<table><tr><th>Status</th><th>Labels</th><th>Task Title</th><th>Summary</th></tr>"
+# (category key, row css class, status cell), in display order
+SECTIONS = (
+    ("blockers", "blockers", "⚠️ Blocker"),
+    ("today", "today", "🚀 Today"),
+    ("yesterday", "yesterday", "✅ Yesterday"),
+)
 
-        if tasks.get('blockers'):
-            for task in tasks['blockers']:
-                labels_html = ''.join([f"<span class='labels'>{label}</span>" for label in task.get('labels', [])])
-                ai_summary = task.get('ai_summary', '').strip()
 
-                summary += f"""
-<tr class='blockers'>
-    <td>⚠️ Blocker</td>
-    <td>{labels_html}</td>
-    <td><a href='{task.get('web_url')}'>{task.get('title')}</a></td>
-    <td>{ai_summary}</td>
-</tr>"""
+def project_tag(task):
+    """Small project label next to a task title, for summaries spanning several projects"""
+    return PROJECT.format(html.escape(str(task['project']))) if task.get('project') else ""
 
-        if tasks.get('today'):
-            for task in tasks['today']:
-                labels_html = ''.join([f"<span class='labels'>{label}</span>" for label in task.get('labels', [])])
-                ai_summary = task.get('ai_summary', '').strip()
+def render_row(task, css, status):
+    return ROW.format(
+        css=css,
+        status=status,
+        labels=''.join(LABEL.format(html.escape(str(label))) for label in task.get('labels', [])),
+        url=html.escape(str(task.get('web_url') or ''), quote=True),
+        title=html.escape(str(task.get('title') or '')),
+        project=project_tag(task),
+        summary=html.escape((task.get('ai_summary') or '').strip()),
+    )
 
-                summary += f"""
-<tr class='today'>
-    <td>🚀 Today</td>
-    <td>{labels_html}</td>
-    <td><a href='{task.get('web_url')}'>{task.get('title')}</a></td>
-    <td>{ai_summary}</td>
-</tr>"""
+def render_summary(categorized, out, heading="Project: Graduate Volunteers"):
+    """Stream the standup HTML to anything with a write() method (file, socket file, buffer).
 
-        if tasks.get('yesterday'):
-            for task in tasks['yesterday']:
-                labels_html = ''.join([f"<span class='labels'>{label}</span>" for label in task.get('labels', [])])
-                ai_summary = task.get('ai_summary', '').strip()
+    Each chunk is written as soon as it is rendered, so memory stays
+    bounded by one row and time is linear in the number of tasks.
+    """
+    out.write(PAGE_HEAD.format(
+        date=datetime.now().strftime("%B %d, %Y"),
+        heading=html.escape(heading),
+    ))
 
-                summary += f"""
-<tr class='yesterday'>
-    <td>✅ Yesterday</td>
-    <td>{labels_html}</td>
-    <td><a href='{task.get('web_url')}'>{task.get('title')}</a></td>
-    <td>{ai_summary}</td>
-</tr>"""
+    for name, tasks in categorized.items():
+        out.write(MEMBER_HEADING.format(name=html.escape(str(name))))
 
-        summary += "</table>"
+        if not any(tasks.get(key) for key, _, _ in SECTIONS):
+            out.write(NO_TASKS)
+            continue
 
-    summary += """
-</div>
-</body>
-</html>"""
-    return summary
\ No newline at end of file
+        out.write(TABLE_HEAD)
+        for key, css, status in SECTIONS:
+            for task in tasks.get(key) or []:
+                out.write(render_row(task, css, status))
+        out.write(TABLE_FOOT)
+
+    out.write(PAGE_FOOT)
+
+def generate_summary(categorized, heading="Project: Graduate Volunteers"):
+    """Generate HTML summary for standup"""
+    buffer = StringIO()
+    render_summary(categorized, buffer, heading)
+    return buffer.getvalue()
@@ -0,0 +1,149 @@
+# utils/metrics.py
+import contextvars
+import json
+import threading
+import time
+from datetime import datetime
+
+
+def _new_stage():
+    return {
+        "wall_time": 0.0,
+        "requests": 0,
+        "bytes": 0,
+        "retries": 0,
+        "errors": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+
+
+class RunMetrics:
+    """Per-run stage timings and API accounting.
+
+    Stages run one after another on the session's script thread; requests
+    made from worker threads (see in_current_run) are charged to whichever
+    stage is active when they finish.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._current = None
+        self._stage_start = None
+
+    def begin(self, name):
+        """Close the active stage (if any) and start timing `name`"""
+        with self._lock:
+            self._close_current()
+            self._stages.setdefault(name, _new_stage())
+            self._current = name
+            self._stage_start = time.perf_counter()
+
+    def finish(self):
+        with self._lock:
+            self._close_current()
+
+    def _close_current(self):
+        if self._current is not None:
+            self._stages[self._current]["wall_time"] += time.perf_counter() - self._stage_start
+        self._current = None
+        self._stage_start = None
+
+    def _stage(self):
+        return self._stages.setdefault(self._current or "other", _new_stage())
+
+    def record_request(self, nbytes=0, retry=False, error=False):
+        with self._lock:
+            stage = self._stage()
+            stage["requests"] += 1
+            stage["bytes"] += nbytes
+            stage["retries"] += int(retry)
+            stage["errors"] += int(error)
+
+    def record_cache(self, hit):
+        with self._lock:
+            self._stage()["cache_hits" if hit else "cache_misses"] += 1
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def rows(self):
+        """One dict per stage, in the order stages were first entered"""
+        with self._lock:
+            stages = {name: dict(data) for name, data in self._stages.items()}
+            if self._current is not None:
+                stages[self._current]["wall_time"] += time.perf_counter() - self._stage_start
+        rows = []
+        for name, data in stages.items():
+            lookups = data["cache_hits"] + data["cache_misses"]
+            rows.append({
+                "stage": name,
+                "wall_time_s": round(data["wall_time"], 3),
+                "requests": data["requests"],
+                "bytes": data["bytes"],
+                "retries": data["retries"],
+                "errors": data["errors"],
+                "cache_hits": data["cache_hits"],
+                "cache_misses": data["cache_misses"],
+                "cache_hit_ratio": round(data["cache_hits"] / lookups, 3) if lookups else None,
+            })
+        return rows
+
+    def to_dict(self):
+        return {
+            "started_at": self.started_at.isoformat(),
+            "total_time_s": round(self.elapsed, 3),
+            "stages": self.rows(),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+
+# Each Streamlit session runs its script in its own thread, so the active run
+# lives in a ContextVar rather than a module global shared by every session
+_active_run = contextvars.ContextVar("active_run", default=None)
+
+
+def start_run():
+    """Start a fresh metrics run and make it the target of request/cache accounting"""
+    run = RunMetrics()
+    _active_run.set(run)
+    return run
+
+
+def current_run():
+    return _active_run.get()
+
+
+def in_current_run(fn):
+    """Wrap `fn` so it records into the caller's run when a worker thread calls it.
+
+    Pool threads do not inherit context variables, so hand tasks over as
+    ``executor.submit(in_current_run(fn), ...)``.
+    """
+    run = _active_run.get()
+
+    def call(*args, **kwargs):
+        token = _active_run.set(run)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _active_run.reset(token)
+    return call
+
+
+def record_request(nbytes=0, retry=False, error=False):
+    run = _active_run.get()
+    if run is not None:
+        run.record_request(nbytes, retry, error)
+
+
+def record_cache(hit):
+    run = _active_run.get()
+    if run is not None:
+        run.record_cache(hit)
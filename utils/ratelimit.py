@@ -0,0 +1,27 @@
+# utils/ratelimit.py
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` calls per second, with bursts up to `burst`"""
+
+    def __init__(self, rate=10, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
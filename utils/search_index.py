@@ -0,0 +1,55 @@
+# utils/search_index.py
+from bisect import bisect_left
+from difflib import get_close_matches
+
+
+class MemberSearchIndex:
+    """Local prefix/substring/fuzzy search over member names and usernames.
+
+    Built once per group; each keystroke is answered from memory: prefix
+    matches on any name word or the username come first (binary search over
+    a sorted token list), then substring matches, then close fuzzy matches.
+    """
+
+    def __init__(self, members):
+        self.members = list(members)
+        entries = set()
+        self._haystacks = []
+        for position, member in enumerate(self.members):
+            username = (member.get("username") or "").casefold()
+            name = (member.get("name") or "").casefold()
+            tokens = {username, name, *name.split()}
+            entries.update((token, position) for token in tokens if token)
+            self._haystacks.append(f"{name} {username}")
+        self._entries = sorted(entries)
+        self._tokens = [token for token, _ in self._entries]
+        self._unique_tokens = sorted(set(self._tokens))
+
+    def __len__(self):
+        return len(self.members)
+
+    def _prefix_positions(self, query):
+        start = bisect_left(self._tokens, query)
+        for token, position in self._entries[start:]:
+            if not token.startswith(query):
+                break
+            yield position
+
+    def search(self, query, limit=25):
+        query = (query or "").casefold().strip()
+        if not query:
+            return []
+
+        ranked = list(dict.fromkeys(self._prefix_positions(query)))
+        if len(ranked) < limit:
+            seen = set(ranked)
+            ranked.extend(
+                position for position, haystack in enumerate(self._haystacks)
+                if position not in seen and query in haystack
+            )
+        if not ranked:
+            for token in get_close_matches(query, self._unique_tokens, n=limit, cutoff=0.75):
+                ranked.extend(self._prefix_positions(token))
+            ranked = list(dict.fromkeys(ranked))
+
+        return [self.members[position] for position in ranked[:limit]]